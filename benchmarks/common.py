@@ -0,0 +1,109 @@
+##
+# Helpers shared by the headless benchmark and the replay driver
+##
+
+import json
+import os
+import sys
+import time
+from statistics import mean, median
+
+import addon_utils
+import bpy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = os.path.basename(ROOT)
+
+
+# arguments after the "--" that ends Blender's own
+def script_args() -> list[str]:
+    return sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+
+
+def load_addon():
+    sys.path.insert(0, os.path.dirname(ROOT))
+    if addon_utils.enable(MODULE, default_set=True) is None:
+        raise RuntimeError("could not enable {}".format(MODULE))
+    return sys.modules[MODULE]
+
+
+# HEAD read straight from the .git directory, "" outside a checkout
+def commit() -> str:
+    git = os.path.join(ROOT, ".git")
+    try:
+        with open(os.path.join(git, "HEAD")) as file:
+            head = file.read().strip()
+        if not head.startswith("ref: "):
+            return head  # detached
+        ref = head[len("ref: ") :]
+        loose = os.path.join(git, *ref.split("/"))
+        if os.path.isfile(loose):
+            with open(loose) as file:
+                return file.read().strip()
+        # refs packed by git gc
+        with open(os.path.join(git, "packed-refs")) as file:
+            for line in file:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return ""
+
+
+# samples in ms
+def summary(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    count = len(samples)
+    if count == 0:
+        return {"runs": 0}
+    return {
+        "runs": count,
+        "min_ms": samples[0],
+        "median_ms": median(samples),
+        "mean_ms": mean(samples),
+        "p95_ms": samples[min(count - 1, int(count * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return summary(samples)
+
+
+def once(func) -> dict:
+    start = time.perf_counter()
+    func()
+    return {"runs": 1, "ms": (time.perf_counter() - start) * 1000.0}
+
+
+# borrows operator and gizmo group methods onto a plain class, bpy types can't be created without a window
+# name mangling resolves against the original class names, pass their prefix for private methods
+def borrow(cls: type, names: tuple[str, ...], prefix: str = "", base: type = object) -> type:
+    return type(
+        "Probe" + cls.__name__,
+        (base,),
+        {prefix + name: cls.__dict__[prefix + name] for name in names},
+    )
+
+
+def write_report(addon, params: dict, results: dict, output: str, **extra):
+    report = {
+        "commit": commit(),
+        "addon_version": ".".join(str(part) for part in addon.bl_info["version"]),
+        "blender": bpy.app.version_string,
+        **extra,
+        "params": params,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
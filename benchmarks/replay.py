@@ -0,0 +1,232 @@
+##
+# Touch event replay
+#   - feeds a log saved with Record Events through the addon operators, back to back
+#   - run it against the .blend the session was recorded in, so editors and objects match
+#   - prints the time per event for each operator and phase as JSON
+#
+# usage:
+#   blender --background session.blend --python benchmarks/replay.py -- --log session.tvrec [--output result.json]
+#
+# operators can't be invoked without a window, so each one runs as a stand-in borrowing its methods
+# execute() of the touch operators only hands off to Blender's navigation operators and is skipped,
+# anything else that needs a window fails and is counted as an error for that operator
+##
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from importlib import import_module
+from types import FunctionType, SimpleNamespace
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import MODULE, borrow, load_addon, script_args, summary, write_report  # noqa: E402  # isort: skip
+
+MAX_ERRORS = 10
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks/replay.py")
+    parser.add_argument("--log", required=True, help="event log saved from the Touchview panel")
+    parser.add_argument("--output", default="", help="write the results here instead of stdout")
+    return parser.parse_args(script_args())
+
+
+class ReplayWindowManager:
+    def modal_handler_add(self, operator):
+        return True
+
+    def event_timer_add(self, time_step, window=None):
+        return None
+
+    def event_timer_remove(self, timer):
+        pass
+
+
+def skip_execute(self, context):
+    return {"FINISHED"}
+
+
+# a plain class with every method of the operator, execute() replaced when it only hands off
+def stand_in(cls: type, hand_off: bool) -> type:
+    names = tuple(name for name, value in cls.__dict__.items() if isinstance(value, FunctionType))
+    probe = borrow(cls, names)
+    probe.bl_idname = cls.bl_idname
+    if hand_off:
+        probe.execute = skip_execute
+    return probe
+
+
+# largest region of the type in any screen of the file, None when the file has none
+def find_region(area_type: str, region_type: str) -> tuple | None:
+    best = None
+    for screen in bpy.data.screens:
+        for area in screen.areas:
+            if area.type != area_type:
+                continue
+            for region in area.regions:
+                if region.type != region_type or region.width <= 1 or region.height <= 1:
+                    continue
+                if best is None or region.width * region.height > best[2].width * best[2].height:
+                    best = (screen, area, region)
+    return best
+
+
+def replay_context(screen, area, region, window_manager) -> SimpleNamespace:
+    space = area.spaces.active
+    return SimpleNamespace(
+        window=None,
+        window_manager=window_manager,
+        screen=screen,
+        area=area,
+        region=region,
+        space_data=space,
+        region_data=getattr(space, "region_3d", None),
+        scene=bpy.context.scene,
+        view_layer=bpy.context.view_layer,
+        mode=bpy.context.mode,
+        active_object=bpy.context.view_layer.objects.active,
+        preferences=bpy.context.preferences,
+        evaluated_depsgraph_get=bpy.context.evaluated_depsgraph_get,
+    )
+
+
+# recorded coordinates are scaled to the region of this file, zones are relative to the region size
+def replay_event(record: dict, region) -> SimpleNamespace:
+    scale_x = region.width / record["width"] if record["width"] else 1.0
+    scale_y = region.height / record["height"] if record["height"] else 1.0
+    x = int(record["x"] * scale_x)
+    y = int(record["y"] * scale_y)
+    return SimpleNamespace(
+        type=record["type"],
+        value=record["value"],
+        pressure=record["pressure"],
+        mouse_region_x=x,
+        mouse_region_y=y,
+        mouse_x=region.x + x,
+        mouse_y=region.y + y,
+        shift=False,
+        ctrl=False,
+        alt=False,
+    )
+
+
+def replay(records: list[dict], operators: dict[str, type]) -> dict:
+    window_manager = ReplayWindowManager()
+    contexts = {}
+    running = {}  # operator -> stand-in waiting for its modal events
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    messages = []
+    skipped = 0
+
+    for record in records:
+        probe = operators.get(record["operator"])
+        key = (record["area"], record["region"])
+        if key not in contexts:
+            found = find_region(*key)
+            contexts[key] = found and (found[1], found[2], replay_context(*found, window_manager))
+        target = contexts[key]
+        if probe is None or target is None:
+            skipped += 1
+            continue
+        if record["phase"] == "invoke":
+            operator = probe()
+        else:
+            operator = running.get(record["operator"])
+            if operator is None:
+                skipped += 1
+                continue
+
+        area, region, context = target
+        event = replay_event(record, region)
+        start = time.perf_counter()
+        try:
+            with bpy.context.temp_override(area=area, region=region):
+                result = getattr(operator, record["phase"])(context, event)
+        except Exception as error:
+            result = {"CANCELLED"}
+            errors[record["operator"]] += 1
+            if len(messages) < MAX_ERRORS:
+                messages.append("{} {}: {}".format(record["operator"], record["phase"], error))
+        samples[(record["operator"], record["phase"])].append((time.perf_counter() - start) * 1000.0)
+
+        if "RUNNING_MODAL" in result:
+            running[record["operator"]] = operator
+        else:
+            running.pop(record["operator"], None)
+
+    results = defaultdict(dict)
+    for (operator, phase), times in sorted(samples.items()):
+        results[operator][phase] = summary(times)
+    for operator, count in errors.items():
+        results[operator]["errors"] = count
+    return {
+        "operators": dict(results),
+        "all": summary([sample for times in samples.values() for sample in times]),
+        "skipped": skipped,
+        "error_messages": messages,
+    }
+
+
+# presses per built-in zone under the current zone settings, classified in one batch per editor type
+# the lock state is not logged, so every 3D view counts as unlocked
+def zone_counts(records: list[dict], geometry, prefs) -> dict:
+    counts = {}
+    for operator in ("touchview.view_ops_3d", "touchview.view_ops_2d"):
+        presses = [r for r in records if r["operator"] == operator and r["phase"] == "invoke" and r["value"] == "PRESS"]
+        if not presses:
+            continue
+        points = np.array([(r["x"], r["y"]) for r in presses], dtype=np.float64)
+        width = np.array([r["width"] for r in presses], dtype=np.float64)
+        if operator == "touchview.view_ops_3d":
+            height = np.array([r["height"] for r in presses], dtype=np.float64)
+            rail, radius = prefs.getWidth(), prefs.getRadius()
+            zones = geometry.classify_3d(points, width, height, rail, radius, False, prefs.swap_panrotate)
+        else:
+            zones = geometry.classify_2d(points, width, prefs.getWidth(), prefs.swap_panrotate)
+        totals = np.bincount(zones, minlength=len(geometry.ZONES))
+        counts[operator] = {name: int(total) for name, total in zip(geometry.ZONES, totals)}
+    return counts
+
+
+def main():
+    args = parse_args()
+    addon = load_addon()
+    recorder = import_module(MODULE + ".source.utils.recorder")
+    geometry = import_module(MODULE + ".source.utils.geometry")
+    blender = import_module(MODULE + ".source.utils.blender")
+    touch = import_module(MODULE + ".source.ops.touch")
+    gizmo = import_module(MODULE + ".source.ops.gizmo")
+
+    operators = {cls.bl_idname: stand_in(cls, True) for cls in touch.classes}
+    operators.update({cls.bl_idname: stand_in(cls, False) for cls in gizmo.classes})
+    records = recorder.read_log(args.log)
+
+    # the drag operators move menus in the preferences, put them back afterwards
+    prefs = bpy.context.preferences.addons[MODULE].preferences
+    saved = prefs.to_dict()
+    prefs.record_events = False
+    try:
+        results = replay(records, operators)
+    finally:
+        prefs.from_dict(saved)
+
+    results["zones"] = zone_counts(records, geometry, blender.snapshot())
+    span = records[-1]["time"] if records else 0.0
+    write_report(
+        addon,
+        vars(args),
+        results,
+        args.output,
+        blend=bpy.data.filepath,
+        events=len(records),
+        recorded_seconds=span,
+    )
+
+
+main()
@@ -0,0 +1,318 @@
+##
+# Headless benchmark
+#   - loads the addon from this checkout and builds synthetic scenes
+#   - times the hot paths and prints JSON that can be diffed across commits
+#
+# usage:
+#   blender --background --factory-startup --python benchmarks/run.py -- [--output result.json]
+#       [--repeat 200] [--objects 400] [--instances 64] [--instanced 16] [--sculpt-verts 2000000]
+#
+# gizmos and shaders need a window, so the gizmo layout runs against stand-in gizmo sets
+# and the overlay is timed up to the values it hands to the shader
+##
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from importlib import import_module
+from types import SimpleNamespace
+
+import bpy
+import numpy as np
+from mathutils import Vector
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import MODULE, borrow, load_addon, measure, once, script_args, write_report  # noqa: E402  # isort: skip
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks/run.py")
+    parser.add_argument("--output", default="", help="write the results here instead of stdout")
+    parser.add_argument("--repeat", type=int, default=200, help="timed runs per benchmark")
+    parser.add_argument("--objects", type=int, default=400, help="mesh objects in the object scene")
+    parser.add_argument("--instances", type=int, default=64, help="collection instances in the instance scene")
+    parser.add_argument("--instanced", type=int, default=16, help="objects in the instanced collection")
+    parser.add_argument("--sculpt-verts", type=int, default=2_000_000, help="vertices of the sculpt mesh")
+    return parser.parse_args(script_args())
+
+
+##
+# Synthetic scenes
+##
+
+
+# (nx * ny) vertex grid over [-size, size], raised into a dome so rays hit at varying depths
+def grid_mesh(name: str, nx: int, ny: int, size: float = 1.0) -> bpy.types.Mesh:
+    xs, ys = np.meshgrid(np.linspace(-size, size, nx), np.linspace(-size, size, ny))
+    zs = np.clip(1.0 - (xs**2 + ys**2) / (size * size), 0.0, None) * size * 0.3
+    co = np.column_stack((xs.ravel(), ys.ravel(), zs.ravel())).astype(np.float32)
+
+    index = np.arange(nx * ny, dtype=np.int32).reshape(ny, nx)
+    quads = np.column_stack(
+        (index[:-1, :-1].ravel(), index[:-1, 1:].ravel(), index[1:, 1:].ravel(), index[1:, :-1].ravel())
+    )
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(quads.size)
+    mesh.loops.foreach_set("vertex_index", quads.ravel())
+    mesh.polygons.add(len(quads))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, quads.size, 4, dtype=np.int32))
+    mesh.update()
+    return mesh
+
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+
+def link(obj: bpy.types.Object, collection: bpy.types.Collection | None = None) -> bpy.types.Object:
+    (collection or bpy.context.scene.collection).objects.link(obj)
+    return obj
+
+
+def set_active(obj: bpy.types.Object):
+    bpy.context.view_layer.objects.active = obj
+    bpy.context.view_layer.update()
+
+
+# a square of tiles sharing one mesh, the middle tile is active
+def object_scene(count: int) -> float:
+    mesh = grid_mesh("bench_tile", 9, 9, 0.45)
+    side = math.ceil(math.sqrt(count))
+    objects = []
+    for i in range(count):
+        obj = link(bpy.data.objects.new("bench_tile_{}".format(i), mesh))
+        obj.location = ((i % side) - side / 2, (i // side) - side / 2, 0.0)
+        objects.append(obj)
+    set_active(objects[(side // 2) * side + side // 2 if count > 1 else 0])
+    return side
+
+
+# empties instancing a collection of tiles that is not linked to the scene, next to one active tile
+def instance_scene(count: int, instanced: int) -> float:
+    mesh = grid_mesh("bench_tile", 9, 9, 0.45)
+    source = bpy.data.collections.new("bench_instanced")
+    side = math.ceil(math.sqrt(instanced))
+    for i in range(instanced):
+        obj = link(bpy.data.objects.new("bench_source_{}".format(i), mesh), source)
+        obj.location = ((i % side) - side / 2, (i // side) - side / 2, 0.0)
+
+    rows = math.ceil(math.sqrt(count))
+    for i in range(count):
+        empty = link(bpy.data.objects.new("bench_instance_{}".format(i), None))
+        empty.instance_type = "COLLECTION"
+        empty.instance_collection = source
+        empty.location = ((i % rows) * side - rows * side / 2, (i // rows) * side - rows * side / 2, -1.0)
+
+    set_active(link(bpy.data.objects.new("bench_active", mesh)))
+    return rows * side
+
+
+def sculpt_scene(vertices: int) -> float:
+    side = max(2, math.isqrt(vertices))
+    set_active(link(bpy.data.objects.new("bench_sculpt", grid_mesh("bench_sculpt", side, side, 4.0))))
+    return 8.0
+
+
+##
+# Stand-ins for types that need a window
+##
+
+
+class ProbeGizmoSet:
+    def __init__(self, has_dependent: bool = False):
+        self.visible = True
+        self.skip_draw = False
+        self.has_dependent = has_dependent
+        self.position = Vector((0.0, 0.0, 0.0))
+
+    def move(self, position: Vector):
+        self.position = position
+
+
+def view_3d() -> tuple[bpy.types.Area, bpy.types.Region, bpy.types.RegionView3D]:
+    for screen in bpy.data.screens:
+        for area in screen.areas:
+            if area.type != "VIEW_3D":
+                continue
+            for region in area.regions:
+                if region.type == "WINDOW" and region.width > 1 and region.height > 1:
+                    return area, region, area.spaces.active.region_3d
+    raise RuntimeError("no 3D view in the loaded screens, run with --factory-startup")
+
+
+def frame_view(rv3d: bpy.types.RegionView3D, extent: float):
+    rv3d.view_perspective = "PERSP"
+    rv3d.view_location = (0.0, 0.0, 0.0)
+    rv3d.view_distance = extent * 1.5
+
+
+##
+# Benchmarks
+##
+
+
+def bench_mouse_target(touch, caches, region, rv3d, repeat: int) -> dict:
+    probe = borrow(
+        touch.TOUCHVIEW_OT_touch_input_3d,
+        ("mouseTarget", "isCurrentObject", "hitDistance", "obj_ray_cast"),
+    )()
+    context = SimpleNamespace(
+        region=region,
+        region_data=rv3d,
+        active_object=bpy.context.view_layer.objects.active,
+        evaluated_depsgraph_get=bpy.context.evaluated_depsgraph_get,
+    )
+    steps = 16
+    events = [
+        SimpleNamespace(
+            mouse_region_x=region.width * (x + 0.5) / steps,
+            mouse_region_y=region.height * (y + 0.5) / steps,
+        )
+        for y in range(steps)
+        for x in range(steps)
+    ]
+    cursor = iter(())
+
+    def target():
+        nonlocal cursor
+        event = next(cursor, None)
+        if event is None:
+            cursor = iter(events)
+            event = next(cursor)
+        probe.mouseTarget(context, event)
+
+    caches.bounds_index.clear()
+    caches.bvh_cache.clear()
+    results = {"cold": once(target)}
+    results["warm"] = measure(target, repeat)
+    return results
+
+
+def bench_gizmo_layout(gizmo_group, area, region, repeat: int) -> dict:
+    probe = borrow(
+        gizmo_group.GIZMO_GT_viewport_gizmo_group,
+        (
+            "__updateOrigin",
+            "__updateActionOrigin",
+            "__updateToggleOrigin",
+            "__menuRadial",
+            "__menuBar",
+            "__safeArea",
+            "__move_gizmo",
+        ),
+        prefix="_GIZMO_GT_viewport_gizmo_group",
+    )()
+    gizmos = [ProbeGizmoSet(has_dependent="has_dependent" in config) for config in gizmo_group.configs]
+    mangled = "_GIZMO_GT_viewport_gizmo_group"
+
+    def origins():
+        getattr(probe, mangled + "__updateOrigin")()
+        getattr(probe, mangled + "__updateActionOrigin")()
+        getattr(probe, mangled + "__updateToggleOrigin")()
+
+    def radial():
+        origins()
+        for gizmo in gizmos:
+            gizmo.skip_draw = False
+        getattr(probe, mangled + "__menuRadial")(gizmos)
+
+    def bar():
+        origins()
+        getattr(probe, mangled + "__menuBar")(gizmos)
+
+    with bpy.context.temp_override(area=area, region=region):
+        return {"radial": measure(radial, repeat), "bar": measure(bar, repeat)}
+
+
+def bench_safe_area(blender, area, region, repeat: int) -> dict:
+    with bpy.context.temp_override(area=area, region=region):
+        return {"safe_area": measure(blender.safe_area_3d, repeat)}
+
+
+def bench_overlay(overlay, region, rv3d, repeat: int) -> dict:
+    zones = overlay.Overlay()
+    return {"geometry": measure(lambda: zones.zoneGeometry(region, rv3d), repeat)}
+
+
+def bench_zones(blender, region, rv3d, repeat: int) -> dict:
+    x, y = region.width * 0.3, region.height * 0.6
+
+    def press():
+        blender.zone_map(region, rv3d).zone_3d(x, y, False)
+
+    def resized():
+        blender.clear_zone_maps()
+        press()
+
+    return {"press": measure(press, repeat), "rebuild": measure(resized, repeat)}
+
+
+# save and load go through a temporary file, the user's preferences.json is never touched
+def bench_preferences(blender, repeat: int) -> dict:
+    prefs = bpy.context.preferences.addons[MODULE].preferences
+    saved = prefs.to_dict()
+    handle, filename = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        return {
+            "snapshot": measure(blender.refresh_snapshot, repeat),
+            "save": measure(lambda: prefs.save(filename), repeat),
+            "load": measure(lambda: prefs.load(filename), repeat),
+        }
+    finally:
+        os.remove(filename)
+        prefs.from_dict(saved)
+        blender.refresh_snapshot()
+
+
+def main():
+    args = parse_args()
+    addon = load_addon()
+    blender = import_module(MODULE + ".source.utils.blender")
+    overlay = import_module(MODULE + ".source.utils.overlay")
+    touch = import_module(MODULE + ".source.ops.touch")
+    gizmo_group = import_module(MODULE + ".source.ui.gizmo_group_2d")
+    caches = SimpleNamespace(
+        bounds_index=import_module(MODULE + ".source.utils.bounds").bounds_index,
+        bvh_cache=import_module(MODULE + ".source.utils.bvh").bvh_cache,
+    )
+
+    area, region, rv3d = view_3d()
+    results = {
+        "gizmo_layout": bench_gizmo_layout(gizmo_group, area, region, args.repeat),
+        "safe_area_3d": bench_safe_area(blender, area, region, args.repeat),
+        "overlay": bench_overlay(overlay, region, rv3d, args.repeat),
+        "zones": bench_zones(blender, region, rv3d, args.repeat),
+        "preferences": bench_preferences(blender, args.repeat),
+        "mouse_target": {},
+    }
+
+    scenes = (
+        ("objects", lambda: object_scene(args.objects)),
+        ("instances", lambda: instance_scene(args.instances, args.instanced)),
+        ("sculpt", lambda: sculpt_scene(args.sculpt_verts)),
+    )
+    for name, build in scenes:
+        clear_scene()
+        start = time.perf_counter()
+        extent = build()
+        build_ms = (time.perf_counter() - start) * 1000.0
+        frame_view(rv3d, extent)
+        results["mouse_target"][name] = bench_mouse_target(touch, caches, region, rv3d, args.repeat)
+        results["mouse_target"][name]["build_ms"] = build_ms
+
+    write_report(addon, vars(args), results, args.output, region=[region.width, region.height])
+
+
+main()
@@ -6,10 +6,16 @@ import bpy
 from bpy.props import *
 from bpy.types import AddonPreferences, PropertyGroup, UILayout
 
+from .source.utils.blender import refresh_snapshot
 from .source.utils.constants import (double_click_items, edit_modes,
-                                     gizmo_sets, menu_defaults,
-                                     menu_orientation_items, menu_style_items,
-                                     pivot_items, position_items)
+                                     gizmo_sets, input_mode_items,
+                                     menu_defaults, menu_orientation_items,
+                                     menu_style_items, pivot_items,
+                                     position_items, zone_editor_items,
+                                     zone_shape_items)
+from .source.utils.geometry import parse_points
+from .source.utils.keymaps import sync_keymaps
+from .source.utils.tracer import tracer
 
 
 def NODE_HT_nendo_header(s, c):
@@ -31,6 +37,25 @@ def update_header_toggle_position(c):
         bpy.types.IMAGE_HT_header.append(NODE_HT_nendo_header)
 
 
+# keep the read-only snapshot used by draw/input code in sync with the stored values
+def update_snapshot(self, _):
+    refresh_snapshot(self)
+
+
+# diagnostics that run for one session only, never saved and switched off on load
+session_only = ("latency_probe", "trace_hot_paths", "record_events")
+
+
+def update_tracer(self, _):
+    tracer.enabled = self.trace_hot_paths
+
+
+# prefs that decide whether the touch operators do anything also toggle their keymap items
+def update_keymaps(self, c):
+    update_snapshot(self, c)
+    sync_keymaps(self)
+
+
 ##
 # Action Menu Settings
 ##
@@ -70,6 +95,79 @@ class TOUCHVIEW_PG_MenuModeGroup(PropertyGroup):
         self.menu_slot_8 = data.get("menu_slot_8", "")
 
 
+##
+# Custom Control Zones
+##
+def update_zones(self, _):
+    refresh_snapshot()
+
+
+class TOUCHVIEW_PG_ControlZone(PropertyGroup):
+    editor: EnumProperty(name="Editor", items=zone_editor_items, default="VIEW_3D", update=update_zones)
+    shape: EnumProperty(name="Shape", items=zone_shape_items, default="RECT", update=update_zones)
+    action: EnumProperty(name="Action", items=input_mode_items, default="PAN", update=update_zones)
+    bounds: FloatVectorProperty(
+        name="Bounds",
+        description="Left, bottom, right and top edge as a fraction of the region",
+        size=4,
+        min=0.0,
+        max=1.0,
+        default=(0.0, 0.0, 0.2, 1.0),
+        update=update_zones,
+    )
+    center: FloatVectorProperty(
+        name="Center",
+        description="Center as a fraction of the region",
+        size=2,
+        min=0.0,
+        max=1.0,
+        default=(0.5, 0.5),
+        update=update_zones,
+    )
+    radius: FloatProperty(
+        name="Radius",
+        description="Radius as a fraction of the shorter region side",
+        min=0.0,
+        max=1.0,
+        default=0.2,
+        update=update_zones,
+    )
+    points: StringProperty(
+        name="Points",
+        description="Polygon corners as fractions of the region: x y, x y, ...",
+        default="0.4 0.4, 0.6 0.4, 0.5 0.6",
+        update=update_zones,
+    )
+
+    # (shape, action, params) for the zone layout engine
+    def spec(self) -> tuple:
+        if self.shape == "RECT":
+            return self.shape, self.action, tuple(self.bounds)
+        if self.shape == "CIRCLE":
+            return self.shape, self.action, (*self.center, self.radius)
+        return self.shape, self.action, parse_points(self.points)
+
+    def to_dict(self):
+        return {
+            "editor": self.editor,
+            "shape": self.shape,
+            "action": self.action,
+            "bounds": list(self.bounds),
+            "center": list(self.center),
+            "radius": self.radius,
+            "points": self.points,
+        }
+
+    def from_dict(self, data: dict):
+        self.editor = data.get("editor", "VIEW_3D")
+        self.shape = data.get("shape", "RECT")
+        self.action = data.get("action", "PAN")
+        self.bounds = data.get("bounds", (0.0, 0.0, 0.2, 1.0))
+        self.center = data.get("center", (0.5, 0.5))
+        self.radius = data.get("radius", 0.2)
+        self.points = data.get("points", "0.4 0.4, 0.6 0.4, 0.5 0.6")
+
+
 class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
     bl_idname = __package__
 
@@ -80,6 +178,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
     is_enabled: BoolProperty(
         name="Enable Controls",
         default=True,
+        update=update_keymaps,
     )
 
     header_toggle_position: EnumProperty(
@@ -96,6 +195,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         name="Lazy Mode",
         default=False,
         description="always control camera when not touching selected object",
+        update=update_keymaps,
     )
 
     toggle_position: FloatVectorProperty(
@@ -104,6 +204,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         soft_max=100,
         size=2,
         default=(0, 0),
+        update=update_snapshot,
     )
 
     toggle_color: FloatVectorProperty(
@@ -113,11 +214,13 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         min=0.0,
         max=1.0,
         size=4,
+        update=update_snapshot,
     )
 
     isVisible: BoolProperty(
         name="Show Overlay",
         default=False,
+        update=update_snapshot,
     )
 
     input_mode: EnumProperty(
@@ -128,34 +231,40 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
             ("TOUCH", "Touch", "Mouse/Touch input only", "VIEW_PAN", 2),
         ],
         default="FULL",
+        update=update_snapshot,
     )
 
     enable_floating_toggle: BoolProperty(
         name="Floating Toggle",
         description="Allows using floating toggle on mixed input mode",
         default=False,
+        update=update_snapshot,
     )
 
     enable_double_click: BoolProperty(
         name="Double Click",
         default=True,
+        update=update_keymaps,
     )
 
     double_click_mode: EnumProperty(
         name="Double Click Mode",
         items=double_click_items,
         default="screen.screen_full_area",
+        update=update_snapshot,
     )
 
     enable_right_click: BoolProperty(
         name="Enable Right Click",
         default=True,
+        update=update_snapshot,
     )
 
     right_click_mode: EnumProperty(
         name="Right Click Mode",
         items=double_click_items,
         default="wm.window_fullscreen_toggle",
+        update=update_snapshot,
     )
 
     right_click_source: EnumProperty(
@@ -166,11 +275,13 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
             ("NONE", "None", "Disabled"),
         ],
         default="MOUSE",
+        update=update_keymaps,
     )
 
     swap_panrotate: BoolProperty(
         name="Swap Pan/Rotate",
         default=False,
+        update=update_snapshot,
     )
 
     width: FloatProperty(
@@ -178,6 +289,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         default=40.0,
         min=10.0,
         max=100,
+        update=update_snapshot,
     )
 
     radius: FloatProperty(
@@ -185,11 +297,25 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         default=35.0,
         min=10.0,
         max=100.0,
+        update=update_snapshot,
+    )
+
+    use_custom_zones: BoolProperty(
+        name="Custom Zones",
+        description="Replace the built-in rails and circle with the zones listed below, per editor",
+        default=False,
+        update=update_snapshot,
+    )
+
+    custom_zones: CollectionProperty(
+        type=TOUCHVIEW_PG_ControlZone,
+        options={"LIBRARY_EDITABLE"},
     )
 
     use_multiple_colors: BoolProperty(
         name="Multicolor Overlay",
         default=False,
+        update=update_snapshot,
     )
 
     overlay_main_color: FloatVectorProperty(
@@ -199,6 +325,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         min=0.0,
         max=1.0,
         size=4,
+        update=update_snapshot,
     )
 
     overlay_secondary_color: FloatVectorProperty(
@@ -208,6 +335,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         min=0.0,
         max=1.0,
         size=4,
+        update=update_snapshot,
     )
 
     ##
@@ -217,29 +345,34 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
     show_menu: BoolProperty(
         name="Toggle Menu Display",
         default=True,
+        update=update_snapshot,
     )
 
     show_gizmos: BoolProperty(
         name="Toggle Gizmos on Menu",
         default=True,
+        update=update_snapshot,
     )
 
     menu_style: EnumProperty(
         name="Menu Style",
         items=menu_style_items,
         default="float.radial",
+        update=update_snapshot,
     )
 
     gizmo_position: EnumProperty(
         name="Gizmo Position",
         items=position_items,
         default="RIGHT",
+        update=update_snapshot,
     )
 
     menu_orientation: EnumProperty(
         name="Menu Orientation",
         items=menu_orientation_items,
         default="HORIZONTAL",
+        update=update_snapshot,
     )
 
     menu_spacing: FloatProperty(
@@ -247,6 +380,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         min=1,
         max=2,
         default=1,
+        update=update_snapshot,
     )
 
     gizmo_scale: FloatProperty(
@@ -254,6 +388,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         min=1,
         max=2,
         default=1,
+        update=update_snapshot,
     )
 
     gizmo_padding: FloatProperty(
@@ -262,6 +397,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         min=0,
         soft_max=24,
         default=4,
+        update=update_snapshot,
     )
 
     menu_position: FloatVectorProperty(
@@ -270,65 +406,78 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         soft_max=100,
         size=2,
         default=(100, 0),
+        update=update_snapshot,
     )
 
     show_undoredo: BoolProperty(
         name="Undo/Redo",
         default=True,
+        update=update_snapshot,
     )
 
     show_is_enabled: BoolProperty(
         name="Toggle Touch",
         default=True,
+        update=update_snapshot,
     )
 
     show_control_gizmo: BoolProperty(
         name="Toggle Control Gizmo",
         default=True,
+        update=update_snapshot,
     )
 
     show_show_fullscreen: BoolProperty(
         name="Fullscreen",
         default=True,
+        update=update_snapshot,
     )
 
     show_region_quadviews: BoolProperty(
         name="Quadview",
         default=True,
+        update=update_snapshot,
     )
 
     show_pivot_mode: BoolProperty(
         name="Pivot Mode",
         default=True,
+        update=update_snapshot,
     )
 
     show_snap_view: BoolProperty(
         name="Snap View",
         default=True,
+        update=update_snapshot,
     )
 
     show_n_panel: BoolProperty(
         name="N Panel",
         default=True,
+        update=update_snapshot,
     )
 
     show_lock_rotation: BoolProperty(
         name="Rotation Lock",
         default=True,
+        update=update_snapshot,
     )
 
     show_multires: BoolProperty(
         name="Multires",
         default=True,
+        update=update_snapshot,
     )
 
     show_voxel_remesh: BoolProperty(
         name="Voxel Remesh",
         default=True,
+        update=update_snapshot,
     )
     show_brush_dynamics: BoolProperty(
         name="Brush Dynamics",
         default=True,
+        update=update_snapshot,
     )
 
     subdivision_limit: IntProperty(
@@ -336,12 +485,113 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         default=4,
         min=1,
         max=7,
+        update=update_snapshot,
     )
 
     pivot_mode: EnumProperty(
         name="Sculpt Pivot Mode",
         items=pivot_items,
         default="SURFACE",
+        update=update_snapshot,
+    )
+
+    proxy_pivot: BoolProperty(
+        name="Proxy Pivot",
+        description="Place the sculpt orbit pivot by ray casting a simplified copy of the mesh",
+        default=False,
+        update=update_snapshot,
+    )
+
+    proxy_resolution: IntProperty(
+        name="Proxy Resolution",
+        description="Grid cells along the longest side of the proxy mesh, higher is more accurate",
+        default=128,
+        min=16,
+        max=1024,
+        update=update_snapshot,
+    )
+
+    ##
+    # Navigation Performance
+    ##
+
+    fast_navigate: BoolProperty(
+        name="Fast Navigate",
+        description="Lighten the viewport while navigating with the control zones",
+        default=False,
+        update=update_snapshot,
+    )
+
+    fast_navigate_level: IntProperty(
+        name="Navigate Subdivision",
+        description="Highest subdivision and multires level shown while navigating",
+        default=0,
+        min=0,
+        max=6,
+        update=update_snapshot,
+    )
+
+    frame_budget: BoolProperty(
+        name="Frame Budget",
+        description="Adjust how much of the viewport is lightened to hold the target frame rate",
+        default=False,
+        update=update_snapshot,
+    )
+
+    target_fps: IntProperty(
+        name="Target FPS",
+        default=30,
+        min=10,
+        max=120,
+        update=update_snapshot,
+    )
+
+    navigation_engine: EnumProperty(
+        name="Navigation",
+        description="Operator used to move the view once a control zone is pressed",
+        items=[
+            ("BLENDER", "Blender", "Hand off to the built-in view operators"),
+            ("TOUCHVIEW", "Touchview", "Move the view directly, one update per redraw"),
+        ],
+        default="BLENDER",
+        update=update_snapshot,
+    )
+
+    kinetic_navigation: BoolProperty(
+        name="Kinetic Scrolling",
+        description="Keep panning and orbiting after a quick swipe is released",
+        default=False,
+        update=update_snapshot,
+    )
+
+    kinetic_friction: FloatProperty(
+        name="Friction",
+        description="How quickly the motion slows down after release",
+        default=4.0,
+        min=0.5,
+        max=20.0,
+        update=update_snapshot,
+    )
+
+    latency_probe: BoolProperty(
+        name="Measure Latency",
+        description="Record the time from a touch event to the next redraw of its region",
+        default=False,
+        update=update_snapshot,
+    )
+
+    trace_hot_paths: BoolProperty(
+        name="Trace Hot Paths",
+        description="Record timing spans of the addon hot paths for Chrome/Perfetto trace export",
+        default=False,
+        update=update_tracer,
+    )
+
+    record_events: BoolProperty(
+        name="Record Events",
+        description="Log the events reaching the touch and drag operators for replay",
+        default=False,
+        update=update_snapshot,
     )
 
     ##
@@ -369,6 +619,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
     show_float_menu: BoolProperty(
         name="Floating Menu",
         default=False,
+        update=update_snapshot,
     )
 
     floating_position: FloatVectorProperty(
@@ -377,12 +628,14 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         soft_max=100,
         size=2,
         default=(100, 0),
+        update=update_snapshot,
     )
 
     double_click_mode: EnumProperty(
         name="Double Click Mode",
         items=double_click_items,
         default="wm.window_fullscreen_toggle",
+        update=update_snapshot,
     )
 
     menu_sets: CollectionProperty(
@@ -426,6 +679,8 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
             "swap_panrotate": self.swap_panrotate,
             "width": self.width,
             "radius": self.radius,
+            "use_custom_zones": self.use_custom_zones,
+            "custom_zones": [z.to_dict() for z in self.custom_zones],
             "use_multiple_colors": self.use_multiple_colors,
             "overlay_main_color": list(self.overlay_main_color),
             "overlay_secondary_color": list(self.overlay_secondary_color),
@@ -452,6 +707,15 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
             "gizmo_position": self.gizmo_position,
             "subdivision_limit": self.subdivision_limit,
             "pivot_mode": self.pivot_mode,
+            "proxy_pivot": self.proxy_pivot,
+            "proxy_resolution": self.proxy_resolution,
+            "fast_navigate": self.fast_navigate,
+            "fast_navigate_level": self.fast_navigate_level,
+            "frame_budget": self.frame_budget,
+            "target_fps": self.target_fps,
+            "navigation_engine": self.navigation_engine,
+            "kinetic_navigation": self.kinetic_navigation,
+            "kinetic_friction": self.kinetic_friction,
             "topology_mode": self.topology_mode,
             "show_float_menu": self.show_float_menu,
             "floating_position": list(self.floating_position),
@@ -477,6 +741,10 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         self.swap_panrotate = data.get("swap_panrotate", False)
         self.width = data.get("width", 40.0)
         self.radius = data.get("radius", 35.0)
+        self.use_custom_zones = data.get("use_custom_zones", False)
+        self.custom_zones.clear()
+        for zone in data.get("custom_zones", []):
+            self.custom_zones.add().from_dict(zone)
         self.use_multiple_colors = data.get("use_multiple_colors", False)
         self.overlay_main_color = data.get("overlay_main_color", (1.0, 1.0, 1.0, 0.01))
         self.overlay_secondary_color = data.get("overlay_secondary_color", (1.0, 1.0, 1.0, 0.01))
@@ -503,6 +771,15 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         self.gizmo_position = data.get("gizmo_position", "RIGHT")
         self.subdivision_limit = data.get("subdivision_limit", 4)
         self.pivot_mode = data.get("pivot_mode", "SURFACE")
+        self.proxy_pivot = data.get("proxy_pivot", False)
+        self.proxy_resolution = data.get("proxy_resolution", 128)
+        self.fast_navigate = data.get("fast_navigate", False)
+        self.fast_navigate_level = data.get("fast_navigate_level", 0)
+        self.frame_budget = data.get("frame_budget", False)
+        self.target_fps = data.get("target_fps", 30)
+        self.navigation_engine = data.get("navigation_engine", "BLENDER")
+        self.kinetic_navigation = data.get("kinetic_navigation", False)
+        self.kinetic_friction = data.get("kinetic_friction", 4.0)
         self.topology_mode = data.get("topology_mode", "MANUAL")
         self.show_float_menu = data.get("show_float_menu", False)
         self.floating_position = data.get("floating_position", (100, 0))
@@ -511,21 +788,23 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
         self.gizmo_tabs = data.get("gizmo_tabs", "GIZMO")
         self.menu_sets = [TOUCHVIEW_PG_MenuModeGroup().from_dict(m) for m in data.get("menu_sets", [])]
 
-    def load(self):
-        filename = path.abspath(path.dirname(__file__) + "/preferences.json")
-        if not path.exists(filename):
-            return None
-
-        data = {}
-        try:
-            with open(filename, "r") as file:
-                data = json.load(file)
-                self.from_dict(data)
-        except Exception as _:
-            return None
-
-    def save(self):
-        filename = path.abspath(path.dirname(__file__) + "/preferences.json")
+    def load(self, filename: str = ""):
+        filename = filename or path.abspath(path.dirname(__file__) + "/preferences.json")
+        if path.exists(filename):
+            try:
+                with open(filename, "r") as file:
+                    self.from_dict(json.load(file))
+            except Exception as _:
+                pass
+        # userpref.blend stores addon preferences too
+        for name in session_only:
+            setattr(self, name, False)
+        refresh_snapshot(self)
+        sync_keymaps(self)
+        tracer.enabled = self.trace_hot_paths
+
+    def save(self, filename: str = ""):
+        filename = filename or path.abspath(path.dirname(__file__) + "/preferences.json")
         with open(filename, "w") as file:
             json.dump(self.to_dict(), file)
 
@@ -569,6 +848,20 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
             col.prop(self, "overlay_secondary_color", text="Secondary Color")
         col.prop(self, "width", slider=True)
         col.prop(self, "radius", slider=True)
+        col.prop(self, "use_custom_zones")
+        if self.use_custom_zones:
+            self.drawCustomZones(col)
+        col.prop(self, "navigation_engine", expand=True)
+        col.prop(self, "kinetic_navigation")
+        if self.kinetic_navigation:
+            col.prop(self, "kinetic_friction", slider=True)
+        col = col.column(align=True)
+        col.prop(self, "fast_navigate")
+        if self.fast_navigate:
+            col.prop(self, "fast_navigate_level", slider=True)
+            col.prop(self, "frame_budget")
+            if self.frame_budget:
+                col.prop(self, "target_fps", slider=True)
 
         # Gixmo Options
         main_box = layout.box()
@@ -608,6 +901,9 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
             col = main_box.column()
             col.label(text="Tool Settings")
             col.prop(self, "subdivision_limit", slider=True)
+            col.prop(self, "proxy_pivot")
+            if self.proxy_pivot:
+                col.prop(self, "proxy_resolution")
 
         if self.gizmo_tabs == "ACTIONS":
             if not self.show_float_menu:
@@ -622,6 +918,24 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
                 for i in range(7):
                     col.prop(mList, "menu_slot_" + str(i + 1))
 
+    # zones of the same editor are tested in list order, the first hit wins
+    def drawCustomZones(self, layout: UILayout):
+        for index, zone in enumerate(self.custom_zones):
+            box = layout.box()
+            row = box.row(align=True)
+            row.prop(zone, "editor", text="")
+            row.prop(zone, "shape", text="")
+            row.prop(zone, "action", text="")
+            row.operator("touchview.remove_zone", text="", icon="X").index = index
+            if zone.shape == "RECT":
+                box.prop(zone, "bounds")
+            elif zone.shape == "CIRCLE":
+                box.prop(zone, "center")
+                box.prop(zone, "radius", slider=True)
+            else:
+                box.prop(zone, "points")
+        layout.operator("touchview.add_zone", icon="ADD")
+
     ##
     # Data Accessors
     ##
@@ -657,6 +971,7 @@ class TOUCHVIEW_AP_OverlaySettings(AddonPreferences):
 
 classes = (
     TOUCHVIEW_PG_MenuModeGroup,
+    TOUCHVIEW_PG_ControlZone,
     TOUCHVIEW_AP_OverlaySettings,
 )
 
@@ -1,14 +1,16 @@
 # flake8: noqa
-from . import actions, gizmo, touch
+from . import actions, gizmo, navigate, touch
 
 
 def register():
     actions.register()
     touch.register()
     gizmo.register()
+    navigate.register()
 
 
 def unregister():
     actions.unregister()
     touch.unregister()
     gizmo.unregister()
+    navigate.unregister()
@@ -1,10 +1,16 @@
 import math
 
 import bpy
+from bpy.props import IntProperty, StringProperty
 from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
 
-from ..utils.blender import preferences
+from ..utils.blender import preferences, refresh_snapshot
 from ..utils.constants import CANCEL, FINISHED, pivot_items
+from ..utils.latency import latency_probe
+from ..utils.pivot import sculpt_pivot
+from ..utils.recorder import event_recorder
+from ..utils.tracer import tracer
 
 
 class TOUCHVIEW_OT_flip_tools(Operator):
@@ -48,7 +54,7 @@ class TOUCHVIEW_OT_next_pivot_mode(Operator):
                 if count == len(pivot_items):
                     count = 0
                 pivot = pivot_items[count][0]
-                bpy.ops.sculpt.set_pivot_position(mode=pivot)
+                sculpt_pivot.update(context, pivot)
                 prefs.pivot_mode = pivot
                 context.area.tag_redraw()
                 return FINISHED
@@ -370,15 +376,131 @@ class TOUCHVIEW_OT_density_down(Operator):
         return FINISHED
 
 
+class TOUCHVIEW_OT_export_latency(Operator, ExportHelper):
+    """Save the touch latency histogram as CSV"""
+
+    bl_label = "Export Latency"
+    bl_idname = "touchview.export_latency"
+
+    filename_ext = ".csv"
+    filter_glob: StringProperty(default="*.csv", options={"HIDDEN"})  # type: ignore
+
+    def execute(self, context):
+        latency_probe.write_csv(self.filepath)
+        return FINISHED
+
+
+class TOUCHVIEW_OT_export_events(Operator, ExportHelper):
+    """Save the recorded touch events as a binary log for replay"""
+
+    bl_label = "Export Events"
+    bl_idname = "touchview.export_events"
+
+    filename_ext = ".tvrec"
+    filter_glob: StringProperty(default="*.tvrec", options={"HIDDEN"})  # type: ignore
+
+    def execute(self, context):
+        event_recorder.write(self.filepath)
+        return FINISHED
+
+
+class TOUCHVIEW_OT_export_trace(Operator, ExportHelper):
+    """Save the recorded hot path spans as Chrome/Perfetto trace-event JSON"""
+
+    bl_label = "Export Trace"
+    bl_idname = "touchview.export_trace"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})  # type: ignore
+
+    def execute(self, context):
+        tracer.write_json(self.filepath)
+        return FINISHED
+
+
+class TOUCHVIEW_OT_reset_events(Operator):
+    """Clear the recorded touch events"""
+
+    bl_label = "Reset Events"
+    bl_idname = "touchview.reset_events"
+
+    def execute(self, context):
+        event_recorder.reset()
+        context.area.tag_redraw()
+        return FINISHED
+
+
+class TOUCHVIEW_OT_reset_latency(Operator):
+    """Clear the recorded touch latency samples"""
+
+    bl_label = "Reset Latency"
+    bl_idname = "touchview.reset_latency"
+
+    def execute(self, context):
+        latency_probe.reset()
+        context.area.tag_redraw()
+        return FINISHED
+
+
+class TOUCHVIEW_OT_reset_trace(Operator):
+    """Clear the recorded hot path spans"""
+
+    bl_label = "Reset Trace"
+    bl_idname = "touchview.reset_trace"
+
+    def execute(self, context):
+        tracer.reset()
+        context.area.tag_redraw()
+        return FINISHED
+
+
+class TOUCHVIEW_OT_add_zone(Operator):
+    """Add a zone to the custom control zones"""
+
+    bl_label = "Add Zone"
+    bl_idname = "touchview.add_zone"
+
+    def execute(self, context):
+        preferences().custom_zones.add()
+        # adding and removing items doesn't run property updates
+        refresh_snapshot()
+        return FINISHED
+
+
+class TOUCHVIEW_OT_remove_zone(Operator):
+    """Remove a zone from the custom control zones"""
+
+    bl_label = "Remove Zone"
+    bl_idname = "touchview.remove_zone"
+
+    index: IntProperty(options={"HIDDEN"})  # type: ignore
+
+    def execute(self, context):
+        prefs = preferences()
+        if not 0 <= self.index < len(prefs.custom_zones):
+            return CANCEL
+        prefs.custom_zones.remove(self.index)
+        refresh_snapshot()
+        return FINISHED
+
+
 classes = (
+    TOUCHVIEW_OT_add_zone,
     TOUCHVIEW_OT_brush_resize,
     TOUCHVIEW_OT_brush_strength,
     TOUCHVIEW_OT_decrease_multires,
     TOUCHVIEW_OT_density_down,
     TOUCHVIEW_OT_density_up,
+    TOUCHVIEW_OT_export_events,
+    TOUCHVIEW_OT_export_latency,
+    TOUCHVIEW_OT_export_trace,
     TOUCHVIEW_OT_flip_tools,
     TOUCHVIEW_OT_increase_multires,
     TOUCHVIEW_OT_next_pivot_mode,
+    TOUCHVIEW_OT_remove_zone,
+    TOUCHVIEW_OT_reset_events,
+    TOUCHVIEW_OT_reset_latency,
+    TOUCHVIEW_OT_reset_trace,
     TOUCHVIEW_OT_toggle_floating_menu,
     TOUCHVIEW_OT_toggle_npanel,
     TOUCHVIEW_OT_toggle_touch_controls,
@@ -4,6 +4,7 @@ from mathutils import Vector
 
 from ..utils.blender import *
 from ..utils.constants import CANCEL, FINISHED, MODAL
+from ..utils.recorder import event_recorder
 
 
 class TOUCHVIEW_OT_move_float_menu(Operator):
@@ -11,6 +12,7 @@ class TOUCHVIEW_OT_move_float_menu(Operator):
     bl_idname = "touchview.move_float_menu"
 
     def invoke(self, context, event):
+        event_recorder.record(self.bl_idname, "invoke", context, event)
         self.has_moved = False
         prefs = preferences()
         fence = safe_area_3d(padding=90)
@@ -41,6 +43,7 @@ class TOUCHVIEW_OT_move_float_menu(Operator):
         return FINISHED
 
     def modal(self, context, event):
+        event_recorder.record(self.bl_idname, "modal", context, event)
         prefs = preferences()
         if event.type == "MOUSEMOVE" and event.value != "RELEASE":  # Apply
             context.region.tag_redraw()
@@ -69,6 +72,7 @@ class TOUCHVIEW_OT_menu_controller(Operator):
     bl_idname = "touchview.move_action_menu"
 
     def invoke(self, context, event):
+        event_recorder.record(self.bl_idname, "invoke", context, event)
         self.has_moved = False
         prefs = preferences()
         fence = safe_area_3d()
@@ -99,6 +103,7 @@ class TOUCHVIEW_OT_menu_controller(Operator):
         return FINISHED
 
     def modal(self, context, event):
+        event_recorder.record(self.bl_idname, "modal", context, event)
         prefs = preferences()
         if event.type == "MOUSEMOVE" and event.value != "RELEASE":  # Apply
             context.region.tag_redraw()
@@ -167,6 +172,7 @@ class TOUCHVIEW_OT_float_controller(Operator):
     bl_idname = "touchview.move_toggle_button"
 
     def invoke(self, context, event):
+        event_recorder.record(self.bl_idname, "invoke", context, event)
         self.has_moved = False
         prefs = preferences()
         fence = safe_area_3d()
@@ -197,6 +203,7 @@ class TOUCHVIEW_OT_float_controller(Operator):
         return FINISHED
 
     def modal(self, context, event):
+        event_recorder.record(self.bl_idname, "modal", context, event)
         prefs = preferences()
         if (
             event.mouse_region_x < 0
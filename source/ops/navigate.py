@@ -0,0 +1,172 @@
+import math
+
+import bpy
+from bpy.props import EnumProperty
+from bpy.types import Operator
+from bpy_extras.view3d_utils import region_2d_to_location_3d
+from mathutils import Quaternion, Vector
+
+from ..utils.blender import snapshot
+from ..utils.constants import (CANCEL, FINISHED, LMOUSE, MODAL, PEN,
+                               input_mode_items)
+from ..utils.kinetic import inertia, motion
+
+# events received and view updates applied, shown in the viewport options
+navigate_stats = {"events": 0, "updates": 0}
+
+# seconds between flushes of a pending move when no new event arrives
+FLUSH_INTERVAL = 1 / 120
+# dolly factor per pixel of vertical drag
+DOLLY_SPEED = 0.005
+
+
+# turntable: yaw around world Z, pitch around the view X axis, both about the view center
+def orbit_view(rv3d: bpy.types.RegionView3D, dx: float, dy: float):
+    sensitivity = bpy.context.preferences.inputs.view_rotate_sensitivity_turntable
+    yaw = Quaternion((0.0, 0.0, 1.0), -dx * sensitivity)
+    pitch = Quaternion((1.0, 0.0, 0.0), dy * sensitivity)
+    rotation = yaw @ rv3d.view_rotation @ pitch
+    rotation.normalize()
+    rv3d.view_rotation = rotation
+
+
+# keep the point under the finger under the finger, at the depth of the view center
+def pan_view(region: bpy.types.Region, rv3d: bpy.types.RegionView3D, dx: float, dy: float):
+    center = rv3d.view_location
+    start = (region.width / 2, region.height / 2)
+    before = region_2d_to_location_3d(region, rv3d, start, center)
+    after = region_2d_to_location_3d(region, rv3d, (start[0] + dx, start[1] + dy), center)
+    rv3d.view_location = center - (Vector(after) - Vector(before))
+
+
+def dolly_view(rv3d: bpy.types.RegionView3D, dy: float):
+    rv3d.view_distance = max(rv3d.view_distance * math.exp(-dy * DOLLY_SPEED), 1e-4)
+
+
+class TOUCHVIEW_OT_navigate_3d(Operator):
+    """Orbit, pan and zoom the view directly from touch drags"""
+
+    bl_label = "Touch Navigate"
+    bl_idname = "touchview.navigate_3d"
+    bl_options = {"BLOCKING"}
+
+    mode: EnumProperty(  # type: ignore
+        name="Mode",
+        description="Sets the viewport control type",
+        items=input_mode_items,
+        options={"HIDDEN"},
+        default="ORBIT",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.area.type == "VIEW_3D" and context.region.type == "WINDOW" and context.region_data is not None
+
+    def invoke(self, context, event):
+        rv3d = context.region_data
+        self.region = context.region
+        self.region_pointer = context.region.as_pointer()
+        self.rv3d = rv3d
+        self.initial = (rv3d.view_location.copy(), rv3d.view_rotation.copy(), rv3d.view_distance)
+        self.last = (event.mouse_region_x, event.mouse_region_y)
+        self.pending = self.last
+        self.active_mode = self.mode
+        # nothing is applied until the region has drawn the previous update
+        self.frame_ready = True
+        motion.clear()
+        motion.push(*self.last)
+
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(FLUSH_INTERVAL, window=context.window)
+        self.handle = bpy.types.SpaceView3D.draw_handler_add(self.__onDraw, (), "WINDOW", "POST_PIXEL")
+        wm.modal_handler_add(self)
+        return MODAL
+
+    def modal(self, context, event):
+        if event.type in {"MOUSEMOVE", "INBETWEEN_MOUSEMOVE"}:
+            navigate_stats["events"] += 1
+            self.pending = (event.mouse_region_x, event.mouse_region_y)
+            motion.push(*self.pending)
+        elif event.type in {LMOUSE, PEN} and event.value == "RELEASE":
+            self.__flush(event)
+            self.__finish(context)
+            self.__coast()
+            return FINISHED
+        elif event.type in {"ESC", "RIGHTMOUSE"}:
+            location, rotation, distance = self.initial
+            self.rv3d.view_location = location
+            self.rv3d.view_rotation = rotation
+            self.rv3d.view_distance = distance
+            self.__finish(context)
+            return CANCEL
+
+        self.__flush(event)
+        return MODAL
+
+    def cancel(self, context):
+        self.__finish(context)
+
+    # apply everything since the last update at most once per redraw
+    def __flush(self, event):
+        # modifiers switch the mode mid-gesture without starting another operator
+        self.active_mode = self.mode
+        if event.shift:
+            self.active_mode = "PAN"
+        elif event.ctrl:
+            self.active_mode = "DOLLY"
+
+        if not self.frame_ready or self.pending == self.last:
+            return
+        dx = self.pending[0] - self.last[0]
+        dy = self.pending[1] - self.last[1]
+
+        if self.active_mode == "ORBIT" and not self.rv3d.lock_rotation:
+            orbit_view(self.rv3d, dx, dy)
+        elif self.active_mode == "DOLLY":
+            dolly_view(self.rv3d, dy)
+        else:
+            pan_view(self.region, self.rv3d, dx, dy)
+
+        navigate_stats["updates"] += 1
+        self.last = self.pending
+        self.frame_ready = False
+        self.region.tag_redraw()
+
+    # keep orbiting/panning with the release velocity
+    def __coast(self):
+        prefs = snapshot()
+        if not prefs.kinetic_navigation or self.active_mode == "DOLLY":
+            return
+        region = self.region
+        rv3d = self.rv3d
+        if self.active_mode == "ORBIT" and not rv3d.lock_rotation:
+
+            def apply(dx, dy):
+                orbit_view(rv3d, dx, dy)
+                region.tag_redraw()
+
+        else:
+
+            def apply(dx, dy):
+                pan_view(region, rv3d, dx, dy)
+                region.tag_redraw()
+
+        inertia.start(motion.velocity(), prefs.kinetic_friction, apply)
+
+    def __onDraw(self):
+        if bpy.context.region is not None and bpy.context.region.as_pointer() == self.region_pointer:
+            self.frame_ready = True
+
+    def __finish(self, context):
+        if self.timer is not None:
+            context.window_manager.event_timer_remove(self.timer)
+            self.timer = None
+        if self.handle is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(self.handle, "WINDOW")
+            self.handle = None
+
+
+classes = (TOUCHVIEW_OT_navigate_3d,)
+
+
+register, unregister = bpy.utils.register_classes_factory(classes)
@@ -1,6 +1,3 @@
-# Built-in modules
-import math
-
 import bpy
 from bpy.props import EnumProperty
 from bpy.types import Operator
@@ -9,15 +6,33 @@ from bpy_extras.view3d_utils import (region_2d_to_origin_3d,
 from mathutils import Vector
 
 # Local modules
-from ..utils.blender import preferences
-from ..utils.constants import (FINISHED, LMOUSE, PASSTHROUGH, PEN, PRESS,
-                               RMOUSE, brush_modes, input_mode_items)
+from ..utils.blender import snapshot, zone_map
+from ..utils.bounds import bounds_index
+from ..utils.bvh import bvh_cache
+from ..utils.constants import (FINISHED, LMOUSE, MODAL, PASSTHROUGH, PEN,
+                               PRESS, RMOUSE, brush_modes, input_mode_items)
+from ..utils.governor import frame_governor
+from ..utils.kinetic import inertia, motion
+from ..utils.latency import latency_probe
+from ..utils.navigation import DEFAULT_LEVEL, navigation_lod
+from ..utils.pivot import proxy_pivot, sculpt_pivot
+from ..utils.recorder import event_recorder
+from ..utils.tracer import traced
 
 
 def is_touch(event):
     return event.pressure in [0.0, 1.0]
 
 
+# move 2D views with the finger by (dx, dy) region pixels
+def pan_2d(area: bpy.types.Area, dx: float, dy: float):
+    if area.type == "IMAGE_EDITOR":
+        zoom = area.spaces.active.zoom
+        bpy.ops.image.view_pan(offset=(-dx / zoom[0], -dy / zoom[1]))  # type: ignore
+    else:
+        bpy.ops.view2d.pan(deltax=int(-dx), deltay=int(-dy))  # type: ignore
+
+
 class TOUCHVIEW_OT_right_click_action(Operator):
     """Viewport right-click shortcut"""
 
@@ -28,8 +43,11 @@ class TOUCHVIEW_OT_right_click_action(Operator):
     def poll(cls, context):
         return context.area.type in {"VIEW_2D", "VIEW_3D"} and context.region.type == "WINDOW"
 
+    @traced("right_click_action.invoke")
     def invoke(self, context, event):
-        prefs = preferences()
+        latency_probe.mark(context.region, "rc_action")
+        event_recorder.record(self.bl_idname, "invoke", context, event)
+        prefs = snapshot()
         if prefs.right_click_source == "NONE":
             return PASSTHROUGH
         if event.type not in [RMOUSE]:
@@ -44,7 +62,7 @@ class TOUCHVIEW_OT_right_click_action(Operator):
         return FINISHED
 
     def execute(self, context):
-        prefs = preferences()
+        prefs = snapshot()
         op = prefs.right_click_mode.split(".")
         if op[1] == "transfer_mode" and context.area.type != "VIEW_3D":
             return PASSTHROUGH
@@ -66,7 +84,10 @@ class TOUCHVIEW_OT_double_click_action(Operator):
     def poll(cls, context):
         return context.area.type in {"NODE_EDITOR", "VIEW_2D", "VIEW_3D", "IMAGE_EDITOR"} and context.region.type == "WINDOW"
 
+    @traced("double_click_action.invoke")
     def invoke(self, context, event):
+        latency_probe.mark(context.region, "dt_action")
+        event_recorder.record(self.bl_idname, "invoke", context, event)
         if event.type not in [PEN, LMOUSE]:
             return PASSTHROUGH
         if not is_touch(event):
@@ -76,7 +97,7 @@ class TOUCHVIEW_OT_double_click_action(Operator):
         return self.execute(context)
 
     def execute(self, context):
-        prefs = preferences()
+        prefs = snapshot()
         if not prefs.enable_double_click:
             return PASSTHROUGH
         op = prefs.double_click_mode.split(".")
@@ -110,8 +131,11 @@ class TOUCHVIEW_OT_touch_input_2d(Operator):
     def poll(cls, context):
         return context.area.type in {"NODE_EDITOR", "VIEW_2D", "IMAGE_EDITOR"} and context.region.type == "WINDOW"
 
+    @traced("touch_input_2d.invoke")
     def invoke(self, context, event):
-        prefs = preferences()
+        latency_probe.mark(context.region, "touch_input_2d")
+        event_recorder.record(self.bl_idname, "invoke", context, event)
+        prefs = snapshot()
         if not prefs.is_enabled:
             return PASSTHROUGH
         if prefs.input_mode == "FULL" and (event.type == PEN or not is_touch(event)):
@@ -120,26 +144,50 @@ class TOUCHVIEW_OT_touch_input_2d(Operator):
         if event.value != PRESS:
             return PASSTHROUGH
         self.delta = (event.mouse_region_x, event.mouse_region_y)
-
-        mid_point = Vector((context.region.width / 2, context.region.height / 2))
-
-        dolly_scale = prefs.getWidth()
-        dolly_wid = mid_point.x * dolly_scale
-
-        if dolly_wid > self.delta[0] or self.delta[0] > context.region.width - dolly_wid:
-            self.mode = "DOLLY"
-        else:
-            self.mode = "PAN"
-
-        if prefs.swap_panrotate:
-            if self.mode == "PAN":
-                self.mode = "ORBIT"
-            elif self.mode == "ORBIT":
-                self.mode = "PAN"
+        zones = zone_map(context.region, editor=context.area.type)
+        self.mode = zones.zone_2d(self.delta[0], self.delta[1], prefs.swap_panrotate)
+
+        inertia.stop()
+        if self.mode == "PAN" and prefs.kinetic_navigation:
+            # track the drag here instead of handing off, the release velocity is needed
+            self.last = self.delta
+            motion.clear()
+            motion.push(*self.delta)
+            context.window_manager.modal_handler_add(self)
+            return MODAL
 
         self.execute(context)
         return FINISHED
 
+    def modal(self, context, event):
+        event_recorder.record(self.bl_idname, "modal", context, event)
+        if event.type in {"MOUSEMOVE", "INBETWEEN_MOUSEMOVE"}:
+            position = (event.mouse_region_x, event.mouse_region_y)
+            pan_2d(context.area, position[0] - self.last[0], position[1] - self.last[1])
+            self.last = position
+            motion.push(*position)
+        elif event.type in {LMOUSE, PEN} and event.value == "RELEASE":
+            self.coast(context)
+            return FINISHED
+        return MODAL
+
+    def coast(self, context):
+        window, area, region = context.window, context.area, context.region
+        remainder = [0.0, 0.0]
+
+        # timers run without an editor context, view2d.pan only takes whole pixels
+        def apply(dx, dy):
+            remainder[0] += dx
+            remainder[1] += dy
+            step = (round(remainder[0]), round(remainder[1]))
+            remainder[0] -= step[0]
+            remainder[1] -= step[1]
+            if step != (0, 0):
+                with bpy.context.temp_override(window=window, area=area, region=region):
+                    pan_2d(area, step[0], step[1])
+
+        inertia.start(motion.velocity(), snapshot().kinetic_friction, apply)
+
     def execute(self, context):
         if context.area.type == "IMAGE_EDITOR":
             return self.exec_image_editor(context)
@@ -177,66 +225,83 @@ class TOUCHVIEW_OT_touch_input_3d(Operator):
     def poll(cls, context):
         return context.area.type == "VIEW_3D" and context.region.type == "WINDOW"
 
+    @traced("touch_input_3d.invoke")
     def invoke(self, context, event):
-        prefs = preferences()
+        latency_probe.mark(context.region, "touch_input_3d")
+        event_recorder.record(self.bl_idname, "invoke", context, event)
+        prefs = snapshot()
         passcheck = self.should_pass(context, event)
         if passcheck:
             return PASSTHROUGH
 
+        inertia.stop()
         self.delta = (event.mouse_region_x, event.mouse_region_y)
 
-        mid_point = Vector((context.region.width / 2, context.region.height / 2))
-
-        dolly_scale = prefs.getWidth()
-        pan_scale = prefs.getRadius()
-
-        dolly_wid = mid_point.x * dolly_scale
-        pan_diameter = math.dist(
-            (0, 0),
-            mid_point,  # type: ignore
-        ) * (pan_scale * 0.5)
-
-        is_quadview_orthographic = context.region_data.is_orthographic_side_view and context.region.alignment == "QUAD_SPLIT"
-        is_locked = context.region_data.lock_rotation or is_quadview_orthographic
-
-        if dolly_wid > self.delta[0] or self.delta[0] > context.region.width - dolly_wid:
-            self.mode = "DOLLY"
-        elif (
-            math.dist(
-                self.delta,
-                mid_point,  # type: ignore
-            )
-            < pan_diameter
-            or is_locked
-        ):
-            self.mode = "PAN"
-        else:
-            self.mode = "ORBIT"
-
-        if prefs.swap_panrotate and not is_locked:
-            if self.mode == "PAN":
-                self.mode = "ORBIT"
-            elif self.mode == "ORBIT":
-                self.mode = "PAN"
+        zones = zone_map(context.region, context.region_data)
+        self.mode = zones.zone_3d(self.delta[0], self.delta[1], prefs.swap_panrotate)
 
         if context.mode == "SCULPT":
-            bpy.ops.sculpt.set_pivot_position(mode=prefs.pivot_mode)
+            # an orbit places its own surface pivot, anything set here would be replaced,
+            # and a surface pivot only matters to the next orbit, which places its own
+            if self.mode == "ORBIT" or prefs.pivot_mode == "SURFACE":
+                sculpt_pivot.skip()
+            else:
+                sculpt_pivot.update(context, prefs.pivot_mode)
+
+        if prefs.fast_navigate:
+            # our handler sits under the navigation operator's and sees nothing until it ends
+            level = DEFAULT_LEVEL
+            if prefs.frame_budget:
+                level = frame_governor.begin(context, prefs.target_fps)
+            navigation_lod.begin(context, level, prefs.fast_navigate_level)
+            self.timer = context.window_manager.event_timer_add(0.05, window=context.window)
+            context.window_manager.modal_handler_add(self)
+            self.execute(context)
+            return MODAL
+
         self.execute(context)
         return FINISHED
 
+    def modal(self, context, event):
+        event_recorder.record(self.bl_idname, "modal", context, event)
+        # first event after release: the gesture is over, restore the viewport
+        self.cancel(context)
+        return FINISHED | PASSTHROUGH
+
+    def cancel(self, context):
+        context.window_manager.event_timer_remove(self.timer)
+        frame_governor.end()
+        navigation_lod.end()
+
     def execute(self, context):
+        prefs = snapshot()
+        if prefs.navigation_engine == "TOUCHVIEW":
+            # the touch engine orbits the view center, only a proxy pivot can move it
+            if self.mode == "ORBIT" and context.mode == "SCULPT" and prefs.proxy_pivot:
+                proxy_pivot.orbit_at(context, self.delta, prefs.proxy_resolution)
+            bpy.ops.touchview.navigate_3d("INVOKE_DEFAULT", mode=self.mode)  # type: ignore
+            return FINISHED
         if self.mode == "DOLLY":
             bpy.ops.view3d.zoom("INVOKE_DEFAULT")  # type: ignore
         elif self.mode == "ORBIT":
             if context.mode == "SCULPT":
-                bpy.ops.sculpt.set_pivot_position(mode="SURFACE", mouse_x=self.delta[0], mouse_y=self.delta[1])
+                self.orbitPivot(context)
             bpy.ops.view3d.rotate("INVOKE_DEFAULT")  # type: ignore
         elif self.mode == "PAN":
             bpy.ops.view3d.move("INVOKE_DEFAULT")  # type: ignore
         return FINISHED
 
+    # with Orbit Around Selection Blender orbits the sculpt pivot, which only set_pivot_position can place
+    def orbitPivot(self, context):
+        prefs = snapshot()
+        if prefs.proxy_pivot and not context.preferences.inputs.use_rotate_around_active:
+            proxy_pivot.orbit_at(context, self.delta, prefs.proxy_resolution)
+            sculpt_pivot.skip()
+        else:
+            sculpt_pivot.surface(self.delta[0], self.delta[1])
+
     def should_pass(self, context, event):
-        prefs = preferences()
+        prefs = snapshot()
 
         # experimental passthrough in drawing mode
         if (
@@ -271,47 +336,59 @@ class TOUCHVIEW_OT_touch_input_3d(Operator):
         self.ray_target = self.ray_origin + view_vector
         return self.isCurrentObject(context)
 
-    def visible_objects_and_duplicates(self, context):
-        depsgraph = context.evaluated_depsgraph_get()
-        for dup in depsgraph.object_instances:
-            if dup.is_instance:  # Real dupli instance
-                obj = dup.instance_object
-                yield (obj, dup.matrix_world.copy())  # type: ignore
-            else:  # Usual object
-                obj = dup.object
-                yield (obj, obj.matrix_world.copy())  # type: ignore
-
-    def obj_ray_cast(self, obj, matrix):
+    def obj_ray_cast(self, obj, matrix_inv, depsgraph):
         # get the ray relative to the object
-        matrix_inv = matrix.inverted()
         ray_origin_obj = matrix_inv @ self.ray_origin
         ray_target_obj = matrix_inv @ self.ray_target
         ray_direction_obj = ray_target_obj - ray_origin_obj
 
-        # cast the ray
-        success, location, normal, face_index = obj.ray_cast(ray_origin_obj, ray_direction_obj)
+        # cast the ray against the cached tree of the evaluated mesh, or the mesh itself when it is too large
+        tree = bvh_cache.get(obj, depsgraph)
+        if tree is not None:
+            location, normal, face_index, _ = tree.ray_cast(ray_origin_obj, ray_direction_obj)
+            success = location is not None
+        else:
+            success, location, normal, face_index = obj.ray_cast(ray_origin_obj, ray_direction_obj)
 
         if success:
             return location, normal, face_index
         else:
             return None, None, None
 
+    # distance along the ray to the object's surface, None when missed
+    def hitDistance(self, obj, matrix, matrix_inv, depsgraph):
+        hit, _, _ = self.obj_ray_cast(obj, matrix_inv, depsgraph)
+        if hit is None:
+            return None
+        return ((matrix @ hit) - self.ray_origin).length
+
+    @traced("isCurrentObject")
     def isCurrentObject(self, context):
-        # cast rays and find the closest object
-        best_length_squared = -1.0
-        best_obj = None
-
-        for obj, matrix in self.visible_objects_and_duplicates(context):
-            if obj.type == "MESH":
-                hit, _, _ = self.obj_ray_cast(obj, matrix)
-                if hit is not None:
-                    hit_world = matrix @ hit
-                    length_squared = (hit_world - self.ray_origin).length_squared
-                    if best_obj is None or length_squared < best_length_squared:
-                        best_length_squared = length_squared
-                        best_obj = obj
-
-        return best_obj.original if best_obj is not None else None
+        # lazy mode only asks whether the active object is under the cursor:
+        # cast against it first, then only against boxes entered before that hit, nearest first
+        depsgraph = context.evaluated_depsgraph_get()
+        active = context.active_object
+        candidates = bounds_index.candidates(depsgraph, self.ray_origin, self.ray_target - self.ray_origin)
+
+        active_distance = None
+        for _, obj, matrix, matrix_inv in candidates:
+            if obj.original != active:
+                continue
+            distance = self.hitDistance(obj, matrix, matrix_inv, depsgraph)
+            if distance is not None and (active_distance is None or distance < active_distance):
+                active_distance = distance
+        if active_distance is None:
+            return None
+
+        for enter, obj, matrix, matrix_inv in candidates:
+            if enter >= active_distance:
+                break
+            if obj.original == active:
+                continue
+            distance = self.hitDistance(obj, matrix, matrix_inv, depsgraph)
+            if distance is not None and distance < active_distance:
+                return obj.original  # first occluder is enough
+        return active
 
 
 classes = (
@@ -2,6 +2,7 @@ import bpy
 from mathutils import Matrix, Vector
 
 from ..utils.blender import *
+from ..utils.tracer import traced
 from .gizmo_config import gizmo_colors, toggle_colors
 
 ##
@@ -31,8 +32,9 @@ class GizmoSet:
         self.has_attribute_bind = self.binding["attribute"] if "attribute" in self.binding else False
         self.primary = self.__buildGizmo(config["command"], config["icon"])
 
+    @traced("GizmoSet.draw_prepare")
     def draw_prepare(self):
-        prefs = preferences()
+        prefs = snapshot()
         self.hidden = not prefs.show_gizmos
         self.skip_draw = False
         self.__updatevisible()
@@ -55,12 +57,12 @@ class GizmoSet:
         self.primary.matrix_basis = Matrix.Translation(position)
 
     def __updatevisible(self):
-        if not preferences().show_menu and self.binding["name"] not in ["float_menu"]:
+        if not snapshot().show_menu and self.binding["name"] not in ["float_menu"]:
             self.visible = False
             self.primary.hide = True
             return
         if self.binding["location"] == "prefs":
-            self.visible = getattr(preferences(), "show_" + self.binding["name"]) and self.binding["name"] in preferences().getGizmoSet(
+            self.visible = getattr(snapshot(), "show_" + self.binding["name"]) and self.binding["name"] in snapshot().getGizmoSet(
                 bpy.context.mode
             )
 
@@ -69,7 +71,7 @@ class GizmoSet:
         self.primary.hide = not self.visible
 
     def __visibilityLock(self) -> bool:
-        if preferences().menu_style == "fixed.bar":
+        if snapshot().menu_style == "fixed.bar":
             return True
         return not self.hidden
 
@@ -141,8 +143,9 @@ class GizmoSetBoolean(GizmoSet):
         self.offGizmo.hide = True
         self.primary = self.onGizmo if state else self.offGizmo
 
+    @traced("GizmoSetBoolean.draw_prepare")
     def draw_prepare(self):
-        prefs = preferences()
+        prefs = snapshot()
         self.hidden = not prefs.show_gizmos
         self.skip_draw = False
         self.__updatevisible()
@@ -152,16 +155,16 @@ class GizmoSetBoolean(GizmoSet):
             self.__setToggleColors(self.primary)
 
     def __updatevisible(self):
-        prefs = preferences()
+        prefs = snapshot()
         bind = self.binding
-        if not preferences().show_menu and (bind["name"] not in ["float_menu"]):
+        if not snapshot().show_menu and (bind["name"] not in ["float_menu"]):
             self.visible = False
             self.primary.hide = True
             return
         if bind["name"] == "float_toggle":
             self.visible = prefs.input_mode != "FULL" or prefs.enable_floating_toggle
         else:
-            self.visible = getattr(preferences(), "show_" + self.binding["name"])
+            self.visible = getattr(snapshot(), "show_" + self.binding["name"])
 
         if self.visible:
             self.visible = (
@@ -176,7 +179,7 @@ class GizmoSetBoolean(GizmoSet):
         self.primary.hide = not self.visible
 
     def __setToggleColors(self, gizmo: bpy.types.Gizmo):
-        mode = "active" if preferences().is_enabled else "inactive"
+        mode = "active" if snapshot().is_enabled else "inactive"
         gizmo.color = toggle_colors[mode]["color"]
         gizmo.color_highlight = toggle_colors[mode]["color_highlight"]
         gizmo.alpha = toggle_colors[mode]["alpha"]
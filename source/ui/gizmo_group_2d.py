@@ -1,10 +1,11 @@
-from math import cos, radians, sin
-
 import bpy
 from bpy.types import GizmoGroup
 from mathutils import Vector
 
 from ..utils.blender import *
+from ..utils.geometry import area_point, bar_layout, radial_layout
+from ..utils.navigation import navigation_lod
+from ..utils.tracer import traced
 from .gizmo_2d import GizmoSet, GizmoSetBoolean
 from .gizmo_config import (brushResizeConfig, brushStrengthConfig,
                            controlGizmoConfig, controllerConfig,
@@ -65,11 +66,18 @@ class GIZMO_GT_viewport_gizmo_group(GizmoGroup):
     bl_region_type = "WINDOW"
     bl_options = {"PERSISTENT", "SCALE"}
 
+    # hidden while a navigation gesture is over its frame budget
+    @classmethod
+    def poll(cls, context):
+        return not navigation_lod.hide_menu
+
     # set up gizmo collection
     def setup(self, context):
         self.gizmo_2d_sets = []
+        self.layout_key = None
+        self.skipped: tuple[bool, ...] = ()
         self.__buildController(context)
-        prefs = preferences()
+        prefs = snapshot()
         self.spacing = prefs.menu_spacing
         for conf in configs:
             if conf["type"] == "boolean":
@@ -88,18 +96,13 @@ class GIZMO_GT_viewport_gizmo_group(GizmoGroup):
         self.toggle = GizmoSetBoolean()
         self.toggle.setup(self, floatingToggleConfig)
 
+    @traced("GizmoGroup.draw_prepare")
     def draw_prepare(self, context):
         self.context = context
-        prefs = preferences()
-        self.__updateOrigin()
-        self.__updateActionOrigin()
-        self.__updateToggleOrigin()
+        prefs = snapshot()
         self.toggle.draw_prepare()
         self.controller.draw_prepare()
         self.action_menu.draw_prepare()
-        self.__move_gizmo(self.controller, self.origin)
-        self.__move_gizmo(self.action_menu, self.action_origin)
-        self.__move_gizmo(self.toggle, self.toggle_origin)
 
         visible_gizmos = []
         for gizmo in self.gizmo_2d_sets:
@@ -107,140 +110,90 @@ class GIZMO_GT_viewport_gizmo_group(GizmoGroup):
             if gizmo.visible:
                 visible_gizmos.append(gizmo)
 
+        # positions only change with the layout inputs, skip placement when none of them did
+        # draw_prepare() of the sets clears skip_draw, so the radial menu's skips are put back from the last layout
+        layout_key = self.__layoutKey(context, prefs, visible_gizmos)
+        if layout_key == self.layout_key:
+            for gizmo, skip in zip(visible_gizmos, self.skipped):
+                gizmo.skip_draw = skip
+            return
+        self.layout_key = layout_key
+        self.skipped = ()
+
+        self.__updateOrigin()
+        self.__updateActionOrigin()
+        self.__updateToggleOrigin()
+        self.__move_gizmo(self.controller, self.origin)
+        self.__move_gizmo(self.action_menu, self.action_origin)
+        self.__move_gizmo(self.toggle, self.toggle_origin)
+
         if prefs.menu_style == "float.radial":
             self.__menuRadial(visible_gizmos)
         if prefs.menu_style == "fixed.bar":
             self.__menuBar(visible_gizmos)
 
-    def __menuBar(self, visible_gizmos: list[GizmoSet]):
-        prefs = preferences()
-        origin = self.origin
-        count = len(visible_gizmos)
-        safe_area = safe_area_3d()
-        origin = Vector(
-            (
-                (safe_area[0].x + safe_area[1].x) / 2,
-                (safe_area[0].y + safe_area[1].y) / 2,
-                0.0,
-            )
+    # everything the menu placement depends on, the snapshot is replaced whenever a pref changes
+    # boolean sets swap their primary gizmo, so the active gizmo is part of the key
+    def __layoutKey(self, context, prefs, visible_gizmos: list[GizmoSet]) -> tuple:
+        return (
+            context.region.width,
+            context.region.height,
+            ui_scale(),
+            context.mode,
+            prefs,
+            safe_area_3d(padding=0),
+            self.toggle.primary,
+            self.controller.primary,
+            self.action_menu.primary,
+            tuple(gizmo.primary for gizmo in visible_gizmos),
         )
 
-        if prefs.gizmo_position == "TOP":
-            origin.y = safe_area[1].y
-        elif prefs.gizmo_position == "BOTTOM":
-            origin.y = safe_area[0].y
-        elif prefs.gizmo_position == "LEFT":
-            origin.x = safe_area[0].x
-        elif prefs.gizmo_position == "RIGHT":
-            origin.x = safe_area[1].x  # - 54  # to avoid overlapping
-
+    def __menuBar(self, visible_gizmos: list[GizmoSet]):
+        prefs = snapshot()
         gizmo_scale = (36 * prefs.gizmo_scale) + prefs.gizmo_padding
         gizmo_padding = prefs.gizmo_padding
         spacing = (gizmo_scale + gizmo_padding) * ui_scale()
 
-        if prefs.gizmo_position in {"TOP", "BOTTOM"} and prefs.menu_style == "fixed.bar":
-            start = origin.x - ((count - 1) * spacing) / 2
-            for i, gizmo in enumerate(visible_gizmos):
-                self.__move_gizmo(gizmo, Vector((start + (i * spacing), origin.y, 0.0)))
-        else:
-            start = origin.y + (count * spacing) / 2
-            for i, gizmo in enumerate(visible_gizmos):
-                self.__move_gizmo(gizmo, Vector((origin.x, start - (i * spacing), 0.0)))
+        positions = bar_layout(self.__safeArea(), prefs.gizmo_position, len(visible_gizmos), spacing)
+        for gizmo, position in zip(visible_gizmos, positions):
+            self.__move_gizmo(gizmo, Vector((*position, 0.0)))
 
     def __menuRadial(self, visible_gizmos: list[GizmoSet]):
-        prefs = preferences()
+        prefs = snapshot()
         # calculate minimum radius to prevent overlapping buttons
         menu_spacing = (36 * prefs.menu_spacing) * prefs.gizmo_scale + prefs.gizmo_padding
         gizmo_scale = 18 * prefs.gizmo_scale
         gizmo_padding = prefs.gizmo_padding
         spacing = (menu_spacing + gizmo_scale + gizmo_padding) * ui_scale()
 
-        count = len(visible_gizmos)
         # reposition Gizmos to origin
-        for i, gizmo in enumerate(visible_gizmos):
-            if gizmo.skip_draw:
-                continue
-
-            if gizmo.has_dependent and i > count / 2:
-                self.__calcMove(gizmo, i + 1, count, spacing)
-                self.__calcMove(visible_gizmos[i + 1], i, count, spacing)
-                visible_gizmos[i + 1].skip_draw = True
-            else:
-                self.__calcMove(gizmo, i, count, spacing)
-
-    def __calcMove(self, gizmo: GizmoSet, step: int, size: int, spacing: float):
-        distance = step / size
-        offset = Vector(
-            (
-                sin(radians(distance * 360)),
-                cos(radians(distance * 360)),
-                0.0,
-            )
+        positions, skipped = radial_layout(
+            self.origin.xy,
+            spacing,
+            [gizmo.has_dependent for gizmo in visible_gizmos],
+            [gizmo.skip_draw for gizmo in visible_gizmos],
         )
-        self.__move_gizmo(gizmo, self.origin + offset * spacing)
+        self.skipped = tuple(skipped)
+        for gizmo, position, skip in zip(visible_gizmos, positions, skipped):
+            gizmo.skip_draw = skip
+            if position is not None:
+                self.__move_gizmo(gizmo, Vector((*position, 0.0)))
 
-    def __updateOrigin(self):
-        prefs = preferences()
-        safe_area = safe_area_3d(padding=90)
-
-        # distance across viewport between menus
-        span = Vector(
-            (
-                safe_area[1].x - safe_area[0].x,
-                safe_area[1].y - safe_area[0].y,
-            )
-        )
+    def __safeArea(self, padding: float = 28) -> tuple:
+        min, max = safe_area_3d(padding)
+        return (min.xy, max.xy)
 
-        # apply position ratio to safe area
-        self.origin = Vector(
-            (
-                safe_area[0].x + span.x * prefs.menu_position[0] * 0.01,
-                safe_area[0].y + span.y * prefs.menu_position[1] * 0.01,
-                0.0,
-            )
-        )
+    def __updateOrigin(self):
+        prefs = snapshot()
+        self.origin = Vector((*area_point(self.__safeArea(padding=90), prefs.menu_position), 0.0))
 
     def __updateActionOrigin(self):
-        prefs = preferences()
-        safe_area = safe_area_3d()
-
-        # distance across viewport between menus
-        span = Vector(
-            (
-                safe_area[1].x - safe_area[0].x,
-                safe_area[1].y - safe_area[0].y,
-            )
-        )
-
-        # apply position ratio to safe area
-        self.action_origin = Vector(
-            (
-                safe_area[0].x + span.x * prefs.floating_position[0] * 0.01,
-                safe_area[0].y + span.y * prefs.floating_position[1] * 0.01,
-                0.0,
-            )
-        )
+        prefs = snapshot()
+        self.action_origin = Vector((*area_point(self.__safeArea(), prefs.floating_position), 0.0))
 
     def __updateToggleOrigin(self):
-        prefs = preferences()
-        safe_area = safe_area_3d()
-
-        # distance across viewport between menus
-        span = Vector(
-            (
-                safe_area[1].x - safe_area[0].x,
-                safe_area[1].y - safe_area[0].y,
-            )
-        )
-
-        # apply position ratio to safe area
-        self.toggle_origin = Vector(
-            (
-                safe_area[0].x + span.x * prefs.toggle_position[0] * 0.01,
-                safe_area[0].y + span.y * prefs.toggle_position[1] * 0.01,
-                0.0,
-            )
-        )
+        prefs = snapshot()
+        self.toggle_origin = Vector((*area_point(self.__safeArea(), prefs.toggle_position), 0.0))
 
     def __move_gizmo(self, gizmo: GizmoSet, position: Vector):
         gizmo.move(position)
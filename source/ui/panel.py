@@ -2,7 +2,14 @@
 import bpy
 from bpy.types import Menu, Panel, UILayout
 
-from ..utils.blender import preferences
+from ..ops.navigate import navigate_stats
+from ..utils.blender import preferences, snapshot_stats
+from ..utils.governor import frame_governor
+from ..utils.latency import latency_probe
+from ..utils.navigation import STAGES, navigation_lod
+from ..utils.pivot import sculpt_pivot
+from ..utils.recorder import event_recorder
+from ..utils.tracer import tracer
 
 
 class TouchView:
@@ -75,6 +82,17 @@ class TOUCHVIEW_PT_control_zones(TouchView, Panel):
         col.prop(prefs, "width", slider=True)
         col.prop(prefs, "radius", slider=True)
 
+        col.prop(prefs, "navigation_engine", expand=True)
+        col.prop(prefs, "kinetic_navigation")
+        if prefs.kinetic_navigation:
+            col.prop(prefs, "kinetic_friction", slider=True)
+
+        col = layout.column(align=True)
+        col.prop(prefs, "fast_navigate")
+        if prefs.fast_navigate:
+            col.prop(prefs, "fast_navigate_level", slider=True)
+            col.prop(prefs, "frame_budget")
+
 
 class TOUCHVIEW_PT_gizmo_bar(TouchView, Panel):
     bl_label = "Gizmo"
@@ -147,6 +165,9 @@ class TOUCHVIEW_PT_tool_settings(TouchView, Panel):
         layout.use_property_split = True
 
         layout.prop(prefs, "subdivision_limit", slider=True)
+        layout.prop(prefs, "proxy_pivot")
+        if prefs.proxy_pivot:
+            layout.prop(prefs, "proxy_resolution")
 
 
 class TOUCHVIEW_PT_viewport_options(TouchView, Panel):
@@ -177,6 +198,61 @@ class TOUCHVIEW_PT_viewport_options(TouchView, Panel):
             col.prop(space, "lock_cursor", text="Lock to Cursor")
             col.prop(view.region_3d, "lock_rotation", text="Lock Rotation")
 
+        if prefs.fast_navigate and prefs.frame_budget:
+            col = layout.column(align=True)
+            col.prop(prefs, "target_fps", slider=True)
+            col.label(text="Measured: {:.1f} FPS".format(frame_governor.fps))
+            # outside a gesture the level is 0, show the one the governor settled on for this object and mode
+            level = navigation_lod.level if navigation_lod.active else frame_governor.settled(context)
+            stage = STAGES[level - 1][1] if level > 0 else "None"
+            col.label(text="Level: {} ({})".format(level, stage))
+
+        col = layout.column(align=True)
+        col.prop(prefs, "latency_probe")
+        if prefs.latency_probe:
+            if latency_probe.count() == 0:
+                col.label(text="Latency: no samples")
+            else:
+                col.label(
+                    text="Latency p50 {:.1f} / p95 {:.1f} / p99 {:.1f} ms".format(
+                        latency_probe.percentile(50), latency_probe.percentile(95), latency_probe.percentile(99)
+                    )
+                )
+            row = col.row(align=True)
+            row.operator("touchview.export_latency", text="Export CSV")
+            row.operator("touchview.reset_latency", text="Reset")
+
+        col = layout.column(align=True)
+        col.prop(prefs, "trace_hot_paths")
+        if prefs.trace_hot_paths:
+            col.label(text="Trace: {} spans buffered".format(tracer.count))
+            row = col.row(align=True)
+            row.operator("touchview.export_trace", text="Export JSON")
+            row.operator("touchview.reset_trace", text="Reset")
+
+        col = layout.column(align=True)
+        col.prop(prefs, "record_events")
+        if prefs.record_events:
+            col.label(text="Recorded: {} events".format(event_recorder.count()))
+            row = col.row(align=True)
+            row.operator("touchview.export_events", text="Export Log")
+            row.operator("touchview.reset_events", text="Reset")
+
+        # each cached read is a preferences() RNA lookup that no longer happens during redraw
+        col = layout.column(align=True)
+        col.label(text="Cached preference reads: {} per redraw".format(snapshot_stats["last_frame"]))
+        col.label(text="Snapshot rebuilds: {}".format(snapshot_stats["rebuilds"]))
+        col.label(
+            text="Touch navigate: {} events, {} view updates".format(
+                navigate_stats["events"], navigate_stats["updates"]
+            )
+        )
+        col.label(
+            text="Sculpt pivot updates: {} ({} skipped)".format(
+                sculpt_pivot.stats["calls"], sculpt_pivot.stats["skipped"]
+            )
+        )
+
 
 class TOUCHVIEW_PT_image_editor_panel(TouchView, Panel):
     bl_space_type = "IMAGE_EDITOR"
@@ -1,4 +1,6 @@
-from . import keymaps
+from . import (bounds, bvh, governor, keymaps, kinetic, latency, navigation,
+               pivot)
+from .blender import clear_snapshot, clear_zone_maps
 from .overlay import Overlay
 
 ov = Overlay()
@@ -6,9 +8,23 @@ ov = Overlay()
 
 def register():
     keymaps.register()
+    bounds.register()
+    bvh.register()
+    governor.register()
+    pivot.register()
+    latency.register()
     ov.drawUI()
 
 
 def unregister():
     ov.clear_overlays()
     keymaps.unregister()
+    bounds.unregister()
+    bvh.unregister()
+    governor.unregister()
+    pivot.unregister()
+    latency.unregister()
+    navigation.unregister()
+    kinetic.unregister()
+    clear_snapshot()
+    clear_zone_maps()
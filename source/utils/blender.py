@@ -3,6 +3,9 @@ from mathutils import Vector
 
 from ... import \
     __package__ as package  # relative import from the root directory
+from .constants import gizmo_sets
+from .geometry import ZoneDescriptor, ZoneLayout, safe_area, view_locked
+from .tracer import traced
 
 
 def preferences() -> dict:
@@ -10,6 +13,142 @@ def preferences() -> dict:
     return bpy.context.preferences.addons[package].preferences  # type: ignore
 
 
+##
+# Preference Snapshot
+#   - read-only copy of the addon preferences for draw and input code
+#   - rebuilt from the property update callbacks, never during a redraw
+#   - writes must still go through preferences()
+##
+class PreferenceSnapshot:
+    __slots__ = (
+        "is_enabled",
+        "lazy_mode",
+        "isVisible",
+        "input_mode",
+        "enable_floating_toggle",
+        "toggle_position",
+        "toggle_color",
+        "enable_double_click",
+        "double_click_mode",
+        "enable_right_click",
+        "right_click_mode",
+        "right_click_source",
+        "swap_panrotate",
+        "width",
+        "radius",
+        "use_multiple_colors",
+        "overlay_main_color",
+        "overlay_secondary_color",
+        "show_menu",
+        "show_gizmos",
+        "menu_style",
+        "gizmo_position",
+        "menu_orientation",
+        "menu_spacing",
+        "gizmo_scale",
+        "gizmo_padding",
+        "menu_position",
+        "show_float_menu",
+        "show_undoredo",
+        "show_is_enabled",
+        "show_control_gizmo",
+        "show_show_fullscreen",
+        "show_region_quadviews",
+        "show_pivot_mode",
+        "show_snap_view",
+        "show_n_panel",
+        "show_lock_rotation",
+        "show_multires",
+        "show_voxel_remesh",
+        "show_brush_dynamics",
+        "subdivision_limit",
+        "pivot_mode",
+        "floating_position",
+        "fast_navigate",
+        "fast_navigate_level",
+        "frame_budget",
+        "target_fps",
+        "proxy_pivot",
+        "proxy_resolution",
+        "navigation_engine",
+        "kinetic_navigation",
+        "kinetic_friction",
+        "latency_probe",
+        "record_events",
+        "use_custom_zones",
+        "custom_zones",
+    )
+
+    def __init__(self, prefs):
+        for name in self.__slots__:
+            value = getattr(prefs, name)
+            # user zones become plain specs grouped by editor, ready for the zone layout engine
+            if name == "custom_zones":
+                value = zone_specs(value)
+            # vector properties are live RNA arrays, copy them out
+            elif not isinstance(value, (bool, int, float, str)):
+                value = tuple(value)
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("preference snapshot is read-only, assign to preferences() instead")
+
+    def getGizmoSet(self, mode: str | int):
+        available = list(gizmo_sets["ALL"])
+
+        if mode not in list(gizmo_sets):
+            return available
+        return available + list(gizmo_sets[mode])
+
+    def getWidth(self):
+        return self.width / 100
+
+    def getRadius(self):
+        return self.radius / 100
+
+
+# editor -> ((shape, action, params), ...) in list order
+def zone_specs(zones) -> dict[str, tuple]:
+    specs: dict[str, list] = {}
+    for zone in zones:
+        specs.setdefault(zone.editor, []).append(zone.spec())
+    return {editor: tuple(items) for editor, items in specs.items()}
+
+
+_snapshot: PreferenceSnapshot | None = None
+
+# reads: snapshot reads since the last frame tick, each one an RNA lookup that no longer happens
+# last_frame: reads served during the previous redraw
+# rebuilds: snapshots rebuilt by preference updates
+snapshot_stats = {"reads": 0, "last_frame": 0, "rebuilds": 0}
+
+
+def snapshot() -> PreferenceSnapshot:
+    """Get the cached, read-only addon preferences."""
+    snapshot_stats["reads"] += 1
+    if _snapshot is None:
+        refresh_snapshot()
+    return _snapshot  # type: ignore
+
+
+def refresh_snapshot(prefs=None):
+    """Rebuild the preference snapshot, called from property update callbacks."""
+    global _snapshot
+    _snapshot = PreferenceSnapshot(prefs if prefs is not None else preferences())
+    snapshot_stats["rebuilds"] += 1
+
+
+def clear_snapshot():
+    global _snapshot
+    _snapshot = None
+
+
+# called once per viewport redraw to roll the read counter into a per-frame figure
+def snapshot_frame_tick():
+    snapshot_stats["last_frame"] = snapshot_stats["reads"]
+    snapshot_stats["reads"] = 0
+
+
 def panel(type) -> tuple:
     """Panel in the region.
 
@@ -38,35 +177,82 @@ def dpi() -> int:
     return bpy.context.preferences.system.dpi
 
 
+# space taken by side panels and headers as (left, right, bottom, top)
+# regions are read in a single pass, reading them is all a cache check would cost, so nothing is kept
+def area_insets(area=None) -> tuple[float, float, float, float]:
+    area = area if area is not None else bpy.context.area
+    # later regions of the same type win, matching panel()
+    panels = {region.type: region for region in area.regions}
+    left = right = bottom = top = 0.0
+    for type in ("TOOLS", "UI"):
+        region = panels.get(type)
+        if region is None:
+            continue
+        if region.alignment == "LEFT":
+            left += region.width
+        elif region.alignment == "RIGHT":
+            right += region.width
+    for type in ("HEADER", "TOOL_HEADER"):
+        region = panels.get(type)
+        if region is None:
+            continue
+        if region.alignment == "BOTTOM":
+            bottom += region.height
+        elif region.alignment == "TOP":
+            top += region.height
+    return (left, right, bottom, top)
+
+
+# region pointer -> (zone inputs, descriptor)
+_zone_maps: dict[int, tuple[tuple, ZoneDescriptor]] = {}
+
+
+# zones of a region, shared by the touch operators and the overlay so drawn and hit-tested zones agree
+# rebuilt when the region resizes, the zone prefs change or the view gets locked
+# quad views are one region per view, each gets its own entry
+def zone_map(region=None, region_data=None, editor: str = "VIEW_3D") -> ZoneDescriptor:
+    region = region if region is not None else bpy.context.region
+    prefs = snapshot()
+    locked = region_data is not None and view_locked(
+        region_data.lock_rotation, region_data.is_orthographic_side_view, region.alignment
+    )
+    specs = prefs.custom_zones.get(editor) if prefs.use_custom_zones else None
+    inputs = (region.width, region.height, prefs.width, prefs.radius, locked, specs)
+    key = region.as_pointer()
+    cached = _zone_maps.get(key)
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+
+    layout = ZoneLayout(specs, region.width, region.height) if specs else None
+    descriptor = ZoneDescriptor(region.width, region.height, prefs.getWidth(), prefs.getRadius(), locked, layout)
+    if cached is None:
+        evict_zone_maps()
+    _zone_maps[key] = (inputs, descriptor)
+    return descriptor
+
+
+# drop regions of closed areas and windows, only runs when a region gets its first entry
+def evict_zone_maps():
+    if not _zone_maps:
+        return
+    live = {
+        region.as_pointer()
+        for window in bpy.context.window_manager.windows
+        for area in window.screen.areas
+        for region in area.regions
+    }
+    for key in [key for key in _zone_maps if key not in live]:
+        del _zone_maps[key]
+
+
+def clear_zone_maps():
+    _zone_maps.clear()
+
+
 # returns a tuple (bottom-left, top-right)
 # safe area in viewport for UI elements
+@traced("safe_area_3d")
 def safe_area_3d(padding: float = 28) -> tuple[Vector, Vector]:
-    buffer = padding * ui_scale()
-    min = Vector((buffer, buffer))
-    max = Vector(
-        (
-            bpy.context.area.width - buffer,
-            bpy.context.area.height - buffer,
-        )
-    )
-
-    if panel("TOOLS")[2] == "LEFT":
-        min.x += panel("TOOLS")[0]
-    elif panel("TOOLS")[2] == "RIGHT":
-        max.x -= panel("TOOLS")[0]
-
-    if panel("UI")[2] == "LEFT":
-        min.x += panel("UI")[0]
-    elif panel("UI")[2] == "RIGHT":
-        max.x -= panel("UI")[0]
-
-    if panel("HEADER")[2] == "BOTTOM":
-        min.y += panel("HEADER")[1]
-    elif panel("HEADER")[2] == "TOP":
-        max.y -= panel("HEADER")[1]
-
-    if panel("TOOL_HEADER")[2] == "BOTTOM":
-        min.y += panel("TOOL_HEADER")[1]
-    elif panel("TOOL_HEADER")[2] == "TOP":
-        max.y -= panel("TOOL_HEADER")[1]
-    return (min, max)
+    area = bpy.context.area
+    min, max = safe_area(area.width, area.height, area_insets(area), padding * ui_scale())
+    return (Vector(min), Vector(max))
@@ -0,0 +1,166 @@
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from mathutils import Matrix, Vector
+
+##
+# BoundsIndex
+#   - world-space AABB per visible mesh and mesh instance
+#   - culls lazy-mode ray cast candidates before any Object.ray_cast
+#   - transform/geometry updates refresh single rows from depsgraph_update_post
+#   - structural changes (collections, visibility, new objects, undo, file load) rebuild on next query
+##
+
+
+class BoundsIndex:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.valid = False
+        self.layer = None
+        self.objects: list[bpy.types.Object] = []  # original objects
+        self.matrices: list[Matrix] = []
+        self.inverses: list[Matrix | None] = []  # filled on first ray cast against the row
+        self.instanced: list[bool] = []
+        self.bounds = np.empty((0, 2, 3))  # rows of (min, max)
+        self.rows: dict[int, int] = {}  # original pointer -> row, plain objects only
+        self.sources: set[int] = set()  # original pointers used as instance sources
+        self.dirty: set[int] = set()
+
+    def invalidate(self):
+        self.valid = False
+        self.dirty.clear()
+
+    def tag(self, update: bpy.types.DepsgraphUpdate):
+        if not self.valid:
+            return
+        # unhiding and view layer excludes arrive as scene or base flag updates, not on the object
+        if isinstance(update.id, (bpy.types.Collection, bpy.types.Scene, bpy.types.ViewLayer)):
+            self.invalidate()
+        elif isinstance(update.id, bpy.types.Object) and (update.is_updated_transform or update.is_updated_geometry):
+            obj = update.id
+            # instancers move every row they place
+            if obj.instance_type != "NONE":
+                self.invalidate()
+            # cameras, lights, armatures and plain empties never get a row, moving them changes nothing
+            elif obj.type == "MESH":
+                self.dirty.add(obj.original.as_pointer())
+
+    # (entry distance, evaluated object, world matrix, inverse matrix) for every box the ray passes through,
+    # nearest first
+    def candidates(self, depsgraph: bpy.types.Depsgraph, origin: Vector, direction: Vector) -> list:
+        self.__sync(depsgraph)
+        if not self.objects:
+            return []
+
+        start = np.array(origin)
+        step = np.array(direction)
+        step[np.abs(step) < 1e-12] = 1e-12
+        near = (self.bounds[:, 0] - start) / step
+        far = (self.bounds[:, 1] - start) / step
+        enter = np.minimum(near, far).max(axis=1)
+        leave = np.maximum(near, far).min(axis=1)
+        hits = np.flatnonzero(leave >= np.maximum(enter, 0.0))
+        hits = hits[np.argsort(enter[hits])]
+
+        found = []
+        for row in hits:
+            obj = self.objects[row]
+            # hiding an object doesn't reach the depsgraph as an object update, check the few hits instead
+            if not self.instanced[row] and not obj.visible_get():
+                continue
+            if self.inverses[row] is None:
+                self.inverses[row] = self.matrices[row].inverted()
+            found.append((float(enter[row]), obj.evaluated_get(depsgraph), self.matrices[row], self.inverses[row]))
+        return found
+
+    def __sync(self, depsgraph: bpy.types.Depsgraph):
+        layer = (depsgraph.scene_eval.as_pointer(), depsgraph.view_layer_eval.as_pointer())
+        if not self.valid or layer != self.layer:
+            self.__build(depsgraph)
+            self.layer = layer
+            return
+
+        for key in self.dirty:
+            row = self.rows.get(key)
+            # new meshes and instance sources move more than one row
+            if row is None or key in self.sources:
+                self.__build(depsgraph)
+                return
+            obj = self.objects[row].evaluated_get(depsgraph)
+            matrix = obj.matrix_world.copy()
+            self.matrices[row] = matrix
+            self.inverses[row] = None
+            self.bounds[row] = world_bounds(obj, matrix)
+        self.dirty.clear()
+
+    def __build(self, depsgraph: bpy.types.Depsgraph):
+        self.clear()
+        bounds = []
+        for dup in depsgraph.object_instances:
+            if dup.is_instance:  # Real dupli instance
+                obj = dup.instance_object
+                matrix = dup.matrix_world.copy()
+            else:  # Usual object
+                obj = dup.object
+                matrix = obj.matrix_world.copy()
+            if obj.type != "MESH":
+                continue
+
+            original = obj.original
+            if dup.is_instance:
+                self.sources.add(original.as_pointer())
+            else:
+                self.rows[original.as_pointer()] = len(self.objects)
+            self.objects.append(original)
+            self.matrices.append(matrix)
+            self.inverses.append(None)
+            self.instanced.append(dup.is_instance)
+            bounds.append(world_bounds(obj, matrix))
+
+        if bounds:
+            self.bounds = np.array(bounds)
+        self.valid = True
+
+
+# axis aligned (min, max) of the object's local bound box in world space
+def world_bounds(obj: bpy.types.Object, matrix: Matrix) -> np.ndarray:
+    corners = np.array(obj.bound_box)
+    transform = np.array(matrix)
+    world = corners @ transform[:3, :3].T + transform[:3, 3]
+    return np.array((world.min(axis=0), world.max(axis=0)))
+
+
+bounds_index = BoundsIndex()
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        bounds_index.tag(update)
+
+
+@persistent
+def on_reset(*_):
+    bounds_index.clear()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.undo_post, on_reset),
+    (bpy.app.handlers.redo_post, on_reset),
+    (bpy.app.handlers.load_post, on_reset),
+)
+
+
+def register():
+    for handler, callback in handlers:
+        handler.append(callback)
+
+
+def unregister():
+    for handler, callback in handlers:
+        if callback in handler:
+            handler.remove(callback)
+    bounds_index.clear()
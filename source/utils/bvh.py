@@ -0,0 +1,110 @@
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from mathutils.bvhtree import BVHTree
+
+##
+# BVHCache
+#   - one BVHTree per mesh (local space), shared by instances and linked duplicates of it
+#   - objects with viewport modifiers evaluate to their own mesh and get a tree of their own
+#   - every geometry update bumps the mesh version, trees are only used for the version they were built from
+#   - trees are built inline on the press that needs them, meshes above TRIANGLE_LIMIT never get one:
+#     BVHTree.FromPolygons holds the GIL, so building them anywhere (worker thread or timer) freezes the UI
+#     for longer than Object.ray_cast costs, often in the middle of a stroke
+#   - get() returns None for those meshes, callers fall back to Object.ray_cast
+##
+
+# triangle count above which no tree is built
+TRIANGLE_LIMIT = 50000
+
+
+class BVHCache:
+    def __init__(self):
+        self.trees: dict[int, tuple[int, BVHTree]] = {}  # tree key -> (version, tree)
+        self.versions: dict[int, int] = {}  # tree key -> geometry version
+
+    def clear(self):
+        self.trees.clear()
+        self.versions.clear()
+
+    def tag(self, update: bpy.types.DepsgraphUpdate):
+        if isinstance(update.id, bpy.types.Object) and update.is_updated_geometry:
+            key = tree_key(update.id)
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph) -> BVHTree | None:
+        key = tree_key(obj)
+        version = self.versions.get(key, 0)
+        entry = self.trees.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        # triangles of the evaluated mesh from its counts, without copying anything
+        mesh = obj.data
+        if len(mesh.loops) - 2 * len(mesh.polygons) > TRIANGLE_LIMIT:
+            return None
+
+        tree = build_tree(*mesh_arrays(obj))
+        self.trees[key] = (version, tree)
+        return tree
+
+
+def build_tree(vertices: np.ndarray, triangles: np.ndarray) -> BVHTree:
+    return BVHTree.FromPolygons(vertices.reshape(-1, 3).tolist(), triangles.reshape(-1, 3).tolist())
+
+
+# mesh data pointer when the evaluated mesh is the mesh itself, the object pointer when modifiers change it
+# toggling a modifier is a geometry update under the new key, so an older tree kept under it is rebuilt
+def tree_key(obj: bpy.types.Object) -> int:
+    original = obj.original
+    if any(modifier.show_viewport for modifier in original.modifiers):
+        return original.as_pointer()
+    return original.data.as_pointer()
+
+
+# copy the evaluated mesh into flat arrays
+def mesh_arrays(obj: bpy.types.Object) -> tuple[np.ndarray, np.ndarray]:
+    mesh = obj.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.vertices.foreach_get("co", vertices)
+        mesh.loop_triangles.foreach_get("vertices", triangles)
+    finally:
+        obj.to_mesh_clear()
+    return vertices, triangles
+
+
+bvh_cache = BVHCache()
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        bvh_cache.tag(update)
+
+
+@persistent
+def on_reset(*_):
+    bvh_cache.clear()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.undo_post, on_reset),
+    (bpy.app.handlers.redo_post, on_reset),
+    (bpy.app.handlers.load_post, on_reset),
+)
+
+
+def register():
+    for handler, callback in handlers:
+        handler.append(callback)
+
+
+def unregister():
+    for handler, callback in handlers:
+        if callback in handler:
+            handler.remove(callback)
+    bvh_cache.clear()
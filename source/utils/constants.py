@@ -40,6 +40,18 @@ input_mode_items = [
     ("DOLLY", "Zoom", "Zoom in/out the viewport"),
 ]
 
+zone_editor_items = [
+    ("VIEW_3D", "3D Viewport", "Zone of the 3D viewport"),
+    ("IMAGE_EDITOR", "Image Editor", "Zone of the image editor"),
+    ("NODE_EDITOR", "Node Editor", "Zone of the node editors"),
+]
+
+zone_shape_items = [
+    ("RECT", "Rectangle", "Rectangle between two corners"),
+    ("CIRCLE", "Circle", "Circle with a radius relative to the shorter region side"),
+    ("POLYGON", "Polygon", "Polygon through a list of points"),
+]
+
 position_items = [
     ("TOP", "Top", "Set Gizmo position to top of viewport"),
     ("RIGHT", "Right", "Set Gizmo position to right of viewport"),
@@ -0,0 +1,321 @@
+import math
+
+import numpy as np
+
+##
+# Geometry
+#   - zone classification, menu placement and safe area math
+#   - imports neither bpy nor mathutils, points are plain (x, y) tuples or numpy arrays
+#   - no relative imports either, the tests load the file by path and run in plain Python (see tests/conftest.py)
+#   - numpy ships with Blender, outside of it it comes from requirements.txt
+##
+
+Point = tuple[float, float]
+
+
+# rail width and pan circle radius in pixels for a region, rail and radius are 0-1 ratios
+def zone_shape(width: float, height: float, rail: float, radius: float) -> tuple[float, float]:
+    mid_x = width * 0.5
+    mid_y = height * 0.5
+    return mid_x * rail, math.hypot(mid_x, mid_y) * (radius * 0.5)
+
+
+# zone codes of the batch classifiers, index into ZONES for the mode name
+DOLLY, PAN, ORBIT = 0, 1, 2
+ZONES = ("DOLLY", "PAN", "ORBIT")
+
+
+# quad view side views are orthographic and can't orbit, same as a locked rotation
+def view_locked(lock_rotation: bool, orthographic_side_view: bool, alignment: str) -> bool:
+    return lock_rotation or (orthographic_side_view and alignment == "QUAD_SPLIT")
+
+
+# zone code per (x, y) row of points: DOLLY on the side rails,
+# PAN inside the circle (or anywhere when rotation is locked), ORBIT elsewhere
+# region size and lock state are scalars or arrays matching the points
+def classify_3d(points, width, height, rail: float, radius: float, locked=False, swap: bool = False) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x = points[:, 0]
+    y = points[:, 1]
+    width = np.asarray(width, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    locked = np.asarray(locked, dtype=bool)
+
+    mid_x = width * 0.5
+    mid_y = height * 0.5
+    rail_width = mid_x * rail
+    pan_radius = np.hypot(mid_x, mid_y) * (radius * 0.5)
+
+    dolly = (x < rail_width) | (x > width - rail_width)
+    pan = locked | (np.hypot(x - mid_x, y - mid_y) < pan_radius)
+    zones = np.where(dolly, DOLLY, np.where(pan, PAN, ORBIT)).astype(np.int8)
+    if swap:
+        # PAN and ORBIT trade places, a locked view keeps panning
+        zones = np.where(dolly | locked, zones, PAN + ORBIT - zones).astype(np.int8)
+    return zones
+
+
+# 2D views have no orbit, only the rails and the pan area, swapping turns the pan area into ORBIT
+def classify_2d(points, width, rail: float, swap: bool = False) -> np.ndarray:
+    x = np.asarray(points, dtype=np.float64).reshape(-1, 2)[:, 0]
+    width = np.asarray(width, dtype=np.float64)
+    rail_width = width * 0.5 * rail
+    dolly = (x < rail_width) | (x > width - rail_width)
+    return np.where(dolly, DOLLY, ORBIT if swap else PAN).astype(np.int8)
+
+
+# single press versions for the operators, the same classifiers on one point
+def zone_3d(
+    x: float, y: float, width: float, height: float, rail: float, radius: float, locked: bool, swap: bool
+) -> str:
+    return ZONES[classify_3d((x, y), width, height, rail, radius, locked, swap)[0]]
+
+
+def zone_2d(x: float, width: float, rail: float, swap: bool) -> str:
+    return ZONES[classify_2d((x, 0.0), width, rail, swap)[0]]
+
+
+SWAPPED = {"PAN": "ORBIT", "ORBIT": "PAN", "DOLLY": "DOLLY"}
+
+# cells per side of the hit-test grid over a region
+GRID_CELLS = 16
+CIRCLE_SEGMENTS = 48
+
+
+# "x y, x y, ..." in normalized coordinates, empty when any pair doesn't parse
+def parse_points(text: str) -> tuple[Point, ...]:
+    points = []
+    for pair in text.split(","):
+        values = pair.split()
+        if len(values) != 2:
+            return ()
+        try:
+            points.append((float(values[0]), float(values[1])))
+        except ValueError:
+            return ()
+    return tuple(points)
+
+
+def point_in_polygon(x: float, y: float, points: tuple[Point, ...]) -> bool:
+    inside = False
+    last_x, last_y = points[-1]
+    for point_x, point_y in points:
+        if (point_y > y) != (last_y > y) and x < (last_x - point_x) * (y - point_y) / (last_y - point_y) + point_x:
+            inside = not inside
+        last_x, last_y = point_x, point_y
+    return inside
+
+
+##
+# ZoneLayout
+#   - user zones of one editor placed in a region
+#   - specs are (shape, action, params) in normalized region coordinates:
+#       RECT (min x, min y, max x, max y), CIRCLE (center x, center y, radius of the shorter side),
+#       POLYGON ((x, y), ...)
+#   - a grid over the region lists the zones overlapping each cell, so a press tests only those
+#   - where zones overlap the first one listed wins
+##
+class ZoneLayout:
+    __slots__ = ("width", "height", "zones", "cells", "cell_width", "cell_height")
+
+    def __init__(self, specs: tuple, width: float, height: float):
+        self.width = width
+        self.height = height
+        self.cell_width = max(width / GRID_CELLS, 1.0)
+        self.cell_height = max(height / GRID_CELLS, 1.0)
+        self.zones: list[tuple[str, str, tuple]] = []  # (shape, action, params in pixels)
+        cells: list[list[int]] = [[] for _ in range(GRID_CELLS * GRID_CELLS)]
+
+        for shape, action, params in specs:
+            placed = self.__place(shape, params)
+            if placed is None:
+                continue
+            params, (min_x, min_y, max_x, max_y) = placed
+            index = len(self.zones)
+            self.zones.append((shape, action, params))
+            for row in range(self.__cell(min_y, self.cell_height), self.__cell(max_y, self.cell_height) + 1):
+                for column in range(self.__cell(min_x, self.cell_width), self.__cell(max_x, self.cell_width) + 1):
+                    cells[row * GRID_CELLS + column].append(index)
+        self.cells = tuple(tuple(cell) for cell in cells)
+
+    # action of the first zone under the point, None outside every zone
+    def hit(self, x: float, y: float) -> str | None:
+        if x < 0 or y < 0 or x > self.width or y > self.height:
+            return None
+        cell = self.cells[self.__cell(y, self.cell_height) * GRID_CELLS + self.__cell(x, self.cell_width)]
+        for index in cell:
+            shape, action, params = self.zones[index]
+            if shape == "RECT":
+                if params[0] <= x <= params[2] and params[1] <= y <= params[3]:
+                    return action
+            elif shape == "CIRCLE":
+                dx = x - params[0]
+                dy = y - params[1]
+                if dx * dx + dy * dy <= params[2] * params[2]:
+                    return action
+            elif point_in_polygon(x, y, params):
+                return action
+        return None
+
+    # (action, outline in pixels) per zone, in drawing order
+    def outlines(self) -> list[tuple[str, list[Point]]]:
+        result = []
+        for shape, action, params in reversed(self.zones):
+            if shape == "RECT":
+                min_x, min_y, max_x, max_y = params
+                outline = [(min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y)]
+            elif shape == "CIRCLE":
+                x, y, radius = params
+                angles = [step * math.tau / CIRCLE_SEGMENTS for step in range(CIRCLE_SEGMENTS)]
+                outline = [(x + math.cos(angle) * radius, y + math.sin(angle) * radius) for angle in angles]
+            else:
+                outline = list(params)
+            result.append((action, outline))
+        return result
+
+    def __cell(self, value: float, size: float) -> int:
+        return min(max(int(value / size), 0), GRID_CELLS - 1)
+
+    # params in pixels and the bounding box, None for shapes that cover nothing
+    def __place(self, shape: str, params: tuple) -> tuple | None:
+        width, height = self.width, self.height
+        if shape == "RECT":
+            min_x, max_x = sorted((params[0] * width, params[2] * width))
+            min_y, max_y = sorted((params[1] * height, params[3] * height))
+            if min_x == max_x or min_y == max_y:
+                return None
+            return (min_x, min_y, max_x, max_y), (min_x, min_y, max_x, max_y)
+        if shape == "CIRCLE":
+            x, y = params[0] * width, params[1] * height
+            radius = params[2] * min(width, height)
+            if radius <= 0:
+                return None
+            return (x, y, radius), (x - radius, y - radius, x + radius, y + radius)
+        if len(params) < 3:
+            return None
+        points = tuple((x * width, y * height) for x, y in params)
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return points, (min(xs), min(ys), max(xs), max(ys))
+
+
+# zone layout of one region, everything a press needs precomputed
+# built-in zones are one comparison against the rails and one against the squared pan radius
+# user zones, when the editor has any, replace them
+class ZoneDescriptor:
+    __slots__ = (
+        "width",
+        "height",
+        "mid_x",
+        "mid_y",
+        "rail_width",
+        "pan_radius",
+        "pan_radius_squared",
+        "locked",
+        "layout",
+    )
+
+    def __init__(self, width: float, height: float, rail: float, radius: float, locked: bool, layout=None):
+        self.width = width
+        self.height = height
+        self.mid_x = width * 0.5
+        self.mid_y = height * 0.5
+        self.rail_width, self.pan_radius = zone_shape(width, height, rail, radius)
+        self.pan_radius_squared = self.pan_radius * self.pan_radius
+        self.locked = locked
+        self.layout: ZoneLayout | None = layout
+
+    def on_rail(self, x: float) -> bool:
+        return x < self.rail_width or x > self.width - self.rail_width
+
+    # built-in zones match classify_3d
+    def zone_3d(self, x: float, y: float, swap: bool) -> str:
+        if self.layout is not None:
+            return self.__userZone(x, y, "ORBIT", swap)
+        if self.on_rail(x):
+            return "DOLLY"
+        if self.locked:
+            return "PAN"
+        dx = x - self.mid_x
+        dy = y - self.mid_y
+        inside = dx * dx + dy * dy < self.pan_radius_squared
+        return "ORBIT" if inside == swap else "PAN"
+
+    # built-in zones match classify_2d
+    def zone_2d(self, x: float, y: float, swap: bool) -> str:
+        if self.layout is not None:
+            return self.__userZone(x, y, "PAN", swap)
+        if self.on_rail(x):
+            return "DOLLY"
+        return "ORBIT" if swap else "PAN"
+
+    # outside every zone the editor's usual background action applies, a locked view can't orbit
+    def __userZone(self, x: float, y: float, default: str, swap: bool) -> str:
+        mode = self.layout.hit(x, y) or default
+        if mode == "DOLLY":
+            return mode
+        if self.locked:
+            return "PAN"
+        return SWAPPED[mode] if swap else mode
+
+
+# (bottom-left, top-right) of a region once panels and padding are taken off
+# insets are (left, right, bottom, top) in pixels, padding is already scaled
+def safe_area(
+    width: float, height: float, insets: tuple[float, float, float, float], padding: float
+) -> tuple[Point, Point]:
+    left, right, bottom, top = insets
+    return (padding + left, padding + bottom), (width - padding - right, height - padding - top)
+
+
+# point at (x, y) percent across a safe area
+def area_point(area: tuple[Point, Point], position: Point) -> Point:
+    (min_x, min_y), (max_x, max_y) = area
+    return (
+        min_x + (max_x - min_x) * position[0] * 0.01,
+        min_y + (max_y - min_y) * position[1] * 0.01,
+    )
+
+
+def radial_point(origin: Point, step: int, size: int, spacing: float) -> Point:
+    angle = math.radians(step / size * 360)
+    return origin[0] + math.sin(angle) * spacing, origin[1] + math.cos(angle) * spacing
+
+
+# positions around a circle, None where a button is not moved
+# a dependent button in the second half swaps places with the one after it, which is then skipped
+def radial_layout(origin: Point, spacing: float, dependent: list[bool], skipped: list[bool]) -> tuple[list, list[bool]]:
+    count = len(dependent)
+    positions: list[Point | None] = [None] * count
+    skip = list(skipped)
+    for i in range(count):
+        if skip[i]:
+            continue
+        if dependent[i] and i > count / 2:
+            positions[i] = radial_point(origin, i + 1, count, spacing)
+            positions[i + 1] = radial_point(origin, i, count, spacing)
+            skip[i + 1] = True
+        else:
+            positions[i] = radial_point(origin, i, count, spacing)
+    return positions, skip
+
+
+# positions along the safe area edge named by side, centered on it
+def bar_layout(area: tuple[Point, Point], side: str, count: int, spacing: float) -> list[Point]:
+    (min_x, min_y), (max_x, max_y) = area
+    x = (min_x + max_x) / 2
+    y = (min_y + max_y) / 2
+    if side == "TOP":
+        y = max_y
+    elif side == "BOTTOM":
+        y = min_y
+    elif side == "LEFT":
+        x = min_x
+    elif side == "RIGHT":
+        x = max_x
+
+    if side in {"TOP", "BOTTOM"}:
+        start = x - ((count - 1) * spacing) / 2
+        return [(start + i * spacing, y) for i in range(count)]
+    start = y + (count * spacing) / 2
+    return [(x, start - i * spacing) for i in range(count)]
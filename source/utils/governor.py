@@ -0,0 +1,97 @@
+import time
+from functools import partial
+
+import bpy
+
+from .navigation import navigation_lod
+
+##
+# FrameGovernor
+#   - times redraws of the region being navigated from a POST_PIXEL handler
+#   - steps the NavigationLOD level up or down to hold the target frame rate
+#   - remembers the settled level per (object, mode) for the next gesture
+##
+
+# frames averaged before each adjustment
+SAMPLE_FRAMES = 8
+# longer gaps mean the finger stopped moving, not a slow frame
+IDLE_FRAME = 0.25
+# hysteresis around the target
+SLOW = 0.9
+FAST = 1.3
+
+
+class FrameGovernor:
+    def __init__(self):
+        self.handle = None
+        self.levels: dict[tuple[str, str], int] = {}
+        self.key = None
+        self.region = None  # pointer of the region being navigated
+        self.target = 30
+        self.last = None
+        self.samples: list[float] = []
+        self.fps = 0.0
+
+    # returns the level to start the gesture at
+    def begin(self, context, target: int) -> int:
+        self.key = self.__key(context)
+        self.region = context.region.as_pointer()
+        self.target = target
+        self.last = None
+        self.samples.clear()
+        return self.levels.get(self.key, 0)
+
+    # level the next gesture on the active object and mode starts at
+    def settled(self, context) -> int:
+        return self.levels.get(self.__key(context), 0)
+
+    def end(self):
+        if self.key is not None:
+            self.levels[self.key] = navigation_lod.level
+        self.key = None
+        self.region = None
+
+    def tick(self):
+        if self.region is None or bpy.context.region.as_pointer() != self.region:
+            return
+        now = time.perf_counter()
+        if self.last is not None and now - self.last < IDLE_FRAME:
+            self.samples.append(now - self.last)
+        self.last = now
+        if len(self.samples) < SAMPLE_FRAMES:
+            return
+
+        self.fps = len(self.samples) / sum(self.samples)
+        self.samples.clear()
+        step = 0
+        if self.fps < self.target * SLOW:
+            step = 1
+        elif self.fps > self.target * FAST:
+            step = -1
+        if step != 0:
+            # scene data can't be changed while drawing, apply on the next timer tick
+            bpy.app.timers.register(partial(navigation_lod.set_level, navigation_lod.level + step), first_interval=0)
+
+    def __key(self, context) -> tuple[str, str]:
+        obj = context.active_object
+        return (obj.name if obj is not None else "", context.mode)
+
+    def register(self):
+        self.handle = bpy.types.SpaceView3D.draw_handler_add(self.tick, (), "WINDOW", "POST_PIXEL")
+
+    def unregister(self):
+        if self.handle is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(self.handle, "WINDOW")
+        self.handle = None
+        self.end()
+
+
+frame_governor = FrameGovernor()
+
+
+def register():
+    frame_governor.register()
+
+
+def unregister():
+    frame_governor.unregister()
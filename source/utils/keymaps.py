@@ -6,6 +6,11 @@ from .constants import (DCLICK, LMOUSE, PRESS, RMOUSE, flat_modes,
 default_keymaps = []
 modified_keymaps = []
 
+# items whose operator only passes through while a preference is off
+touch_keymaps = []  # (kmi, is 3D view)
+right_click_keymaps = []
+double_click_keymaps = []
+
 
 # added timer to ensure Blender keyconfig is fully populated before running
 def register():
@@ -40,12 +45,32 @@ def assign_keymaps():
                 main_action = "touchview.view_ops_3d"
             kmi = km.keymap_items.new(main_action, LMOUSE, PRESS)
             modified_keymaps.append((km, kmi))
+            touch_keymaps.append((kmi, main_action == "touchview.view_ops_3d"))
 
             kmi = km.keymap_items.new("touchview.dt_action", LMOUSE, DCLICK)
             modified_keymaps.append((km, kmi))
+            double_click_keymaps.append(kmi)
 
             kmi = km.keymap_items.new("touchview.rc_action", RMOUSE, PRESS)
             modified_keymaps.append((km, kmi))
+            right_click_keymaps.append(kmi)
+
+
+# disabled features skip the keymap entirely instead of entering invoke() to pass through
+# lazy mode still needs the 3D press to test the object under the cursor
+def sync_keymaps(prefs):
+    for kmi, is_3d in touch_keymaps:
+        set_kmi_active(kmi, prefs.is_enabled or (is_3d and prefs.lazy_mode))
+    for kmi in right_click_keymaps:
+        set_kmi_active(kmi, prefs.right_click_source != "NONE")
+    for kmi in double_click_keymaps:
+        set_kmi_active(kmi, prefs.enable_double_click)
+
+
+# only touch changed items, every write tags the keyconfig for an update
+def set_kmi_active(kmi, state: bool):
+    if kmi.active != state:
+        kmi.active = state
 
 
 # unset MOUSE viewport control, reset PEN to MOUSE input
@@ -57,3 +82,6 @@ def unregister():
         kmi.active = state
     modified_keymaps.clear()
     default_keymaps.clear()
+    touch_keymaps.clear()
+    right_click_keymaps.clear()
+    double_click_keymaps.clear()
@@ -0,0 +1,131 @@
+import math
+import time
+
+import bpy
+
+##
+# Kinetic navigation
+#   - MotionRing keeps the last few drag samples in preallocated slots
+#   - Inertia integrates a decaying velocity with a fixed step from bpy.app.timers
+#   - the timer unregisters itself once the motion is below STOP_SPEED, so idle cost is zero
+##
+
+RING_SIZE = 16
+# only samples this recent are used to estimate the release velocity
+SAMPLE_WINDOW = 0.08
+STEP = 1 / 60
+# pixels per second
+STOP_SPEED = 20.0
+
+
+class MotionRing:
+    __slots__ = ("times", "xs", "ys", "head", "count")
+
+    def __init__(self, size: int = RING_SIZE):
+        self.times = [0.0] * size
+        self.xs = [0.0] * size
+        self.ys = [0.0] * size
+        self.head = 0
+        self.count = 0
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def push(self, x: float, y: float, now: float | None = None):
+        self.times[self.head] = time.perf_counter() if now is None else now
+        self.xs[self.head] = x
+        self.ys[self.head] = y
+        self.head = (self.head + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+
+    # pixels per second between the oldest and newest sample inside the window
+    def velocity(self, now: float | None = None) -> tuple[float, float]:
+        now = time.perf_counter() if now is None else now
+        size = len(self.times)
+        newest = (self.head - 1) % size
+        if self.count < 2 or now - self.times[newest] > SAMPLE_WINDOW:
+            return (0.0, 0.0)  # finger stopped before release
+
+        oldest = newest
+        for back in range(1, self.count):
+            index = (newest - back) % size
+            if now - self.times[index] > SAMPLE_WINDOW:
+                break
+            oldest = index
+        elapsed = self.times[newest] - self.times[oldest]
+        if elapsed <= 0.0:
+            return (0.0, 0.0)
+        return (
+            (self.xs[newest] - self.xs[oldest]) / elapsed,
+            (self.ys[newest] - self.ys[oldest]) / elapsed,
+        )
+
+
+class Inertia:
+    def __init__(self):
+        self.velocity = (0.0, 0.0)
+        self.friction = 4.0
+        self.apply = None  # callable(dx, dy) in pixels
+        self.last = 0.0
+        self.remainder = 0.0
+        # the same bound method for every timers call, a fresh self.__step never matches the registered one
+        self.timer = self.__step
+
+    @property
+    def running(self) -> bool:
+        return bpy.app.timers.is_registered(self.timer)
+
+    def start(self, velocity: tuple[float, float], friction: float, apply):
+        self.stop()
+        if math.hypot(*velocity) < STOP_SPEED:
+            return
+        self.velocity = velocity
+        self.friction = friction
+        self.apply = apply
+        self.last = time.perf_counter()
+        self.remainder = 0.0
+        bpy.app.timers.register(self.timer, first_interval=STEP)
+
+    def stop(self):
+        if self.running:
+            bpy.app.timers.unregister(self.timer)
+        self.apply = None
+        self.velocity = (0.0, 0.0)
+
+    # timers fire late, run as many fixed steps as time has passed and apply the sum once
+    def __step(self):
+        now = time.perf_counter()
+        self.remainder += now - self.last
+        self.last = now
+
+        vx, vy = self.velocity
+        decay = math.exp(-self.friction * STEP)
+        dx = dy = 0.0
+        while self.remainder >= STEP:
+            dx += vx * STEP
+            dy += vy * STEP
+            vx *= decay
+            vy *= decay
+            self.remainder -= STEP
+        self.velocity = (vx, vy)
+
+        try:
+            if dx != 0.0 or dy != 0.0:
+                self.apply(dx, dy)
+        except ReferenceError:
+            self.apply = None  # view closed while coasting
+            return None
+
+        if math.hypot(vx, vy) < STOP_SPEED:
+            self.apply = None
+            return None
+        return STEP
+
+
+motion = MotionRing()
+inertia = Inertia()
+
+
+def unregister():
+    inertia.stop()
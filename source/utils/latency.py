@@ -0,0 +1,107 @@
+import time
+
+import bpy
+
+from .blender import snapshot
+
+##
+# LatencyProbe
+#   - touch operators mark the region they act on when an event enters invoke()
+#   - the next POST_PIXEL draw of that region closes the sample
+#   - samples go into fixed-width histograms per source, nothing is allocated per sample
+##
+
+BUCKET_MS = 0.5
+BUCKETS = 1000  # up to 500ms, the last bucket also collects everything slower
+# marks older than this never got a redraw, drop them instead of recording a bogus sample
+STALE = 1.0
+
+SPACES = (bpy.types.SpaceView3D, bpy.types.SpaceImageEditor, bpy.types.SpaceNodeEditor)
+
+
+class LatencyProbe:
+    def __init__(self):
+        self.pending: dict[int, tuple[float, str]] = {}  # region pointer -> (time, source)
+        self.histograms: dict[str, list[int]] = {}
+        self.handles = []
+
+    def mark(self, region: bpy.types.Region, source: str):
+        if not snapshot().latency_probe or region is None:
+            return
+        self.pending[region.as_pointer()] = (time.perf_counter(), source)
+
+    def reset(self):
+        self.pending.clear()
+        self.histograms.clear()
+
+    def __onDraw(self):
+        if not self.pending:
+            return
+        region = bpy.context.region
+        if region is None:
+            return
+        mark = self.pending.pop(region.as_pointer(), None)
+        if mark is None:
+            return
+        elapsed = time.perf_counter() - mark[0]
+        if elapsed > STALE:
+            return
+        histogram = self.histograms.get(mark[1])
+        if histogram is None:
+            histogram = self.histograms[mark[1]] = [0] * BUCKETS
+        histogram[min(int(elapsed * 1000 / BUCKET_MS), BUCKETS - 1)] += 1
+
+    def count(self, source: str | None = None) -> int:
+        return sum(self.__merged(source))
+
+    # upper edge in ms of the bucket holding the given percentile, None without samples
+    def percentile(self, percent: float, source: str | None = None) -> float | None:
+        histogram = self.__merged(source)
+        total = sum(histogram)
+        if total == 0:
+            return None
+        threshold = total * percent / 100
+        running = 0
+        for index, count in enumerate(histogram):
+            running += count
+            if running >= threshold:
+                return (index + 1) * BUCKET_MS
+        return BUCKETS * BUCKET_MS
+
+    def __merged(self, source: str | None) -> list[int]:
+        if source is not None:
+            return self.histograms.get(source, [0] * BUCKETS)
+        merged = [0] * BUCKETS
+        for histogram in self.histograms.values():
+            for index, count in enumerate(histogram):
+                merged[index] += count
+        return merged
+
+    def write_csv(self, filepath: str):
+        with open(filepath, "w") as file:
+            file.write("source,bucket_start_ms,bucket_end_ms,count\n")
+            for source, histogram in sorted(self.histograms.items()):
+                for index, count in enumerate(histogram):
+                    if count > 0:
+                        file.write("{},{},{},{}\n".format(source, index * BUCKET_MS, (index + 1) * BUCKET_MS, count))
+
+    def register(self):
+        for space in SPACES:
+            self.handles.append((space, space.draw_handler_add(self.__onDraw, (), "WINDOW", "POST_PIXEL")))
+
+    def unregister(self):
+        for space, handle in self.handles:
+            space.draw_handler_remove(handle, "WINDOW")
+        self.handles = []
+        self.reset()
+
+
+latency_probe = LatencyProbe()
+
+
+def register():
+    latency_probe.register()
+
+
+def unregister():
+    latency_probe.unregister()
@@ -0,0 +1,127 @@
+##
+# NavigationLOD
+#   - lightens the viewport for the length of one touch navigation gesture
+#   - degradation is applied in stages, level N has the first N stages applied
+#   - remembers every value it changes and puts them back when a stage is lifted
+##
+
+STAGES = (
+    ("OVERLAYS", "Overlays"),
+    ("SUBDIVISION", "Subdivision"),
+    ("MENU", "Gizmo Menu"),
+    ("ZONES", "Zone Overlay"),
+)
+MAX_LEVEL = len(STAGES)
+# level used when the frame budget governor is off
+DEFAULT_LEVEL = 2
+
+
+class NavigationLOD:
+    def __init__(self):
+        self.stages = [[] for _ in STAGES]  # per stage: (owner, attribute, original value)
+        self.level = 0
+        self.scene = None
+        self.space = None
+        self.objects = []
+        self.sculpt_object = None
+        self.subdivision = 0
+        # runtime only, never written to the saved preferences
+        self.hide_menu = False
+        self.hide_overlay = False
+
+    @property
+    def active(self) -> bool:
+        return self.space is not None
+
+    def begin(self, context, level: int, subdivision: int):
+        if self.active:
+            return
+        # capture everything needed so stages can change later from timers, without a 3D view context
+        self.scene = context.scene
+        self.space = context.space_data
+        self.objects = [obj for obj in context.visible_objects if obj.type == "MESH"]
+        self.sculpt_object = context.active_object if context.mode == "SCULPT" else None
+        self.subdivision = subdivision
+        self.set_level(level)
+
+    def end(self):
+        if not self.active:
+            return
+        self.set_level(0)
+        self.scene = None
+        self.space = None
+        self.objects = []
+        self.sculpt_object = None
+
+    def set_level(self, level: int):
+        if not self.active:
+            return
+        level = max(0, min(level, MAX_LEVEL))
+        while self.level > level:
+            self.level -= 1
+            self.__restoreStage(self.level)
+        while self.level < level:
+            self.__applyStage(self.level)
+            self.level += 1
+
+    def __applyStage(self, stage: int):
+        name = STAGES[stage][0]
+        try:
+            if name == "OVERLAYS":
+                self.__set(stage, self.space.shading, "show_cavity", False)
+                self.__set(stage, self.space.shading, "show_shadows", False)
+                self.__set(stage, self.space.overlay, "show_wireframes", False)
+                self.__set(stage, self.space.overlay, "show_face_orientation", False)
+            elif name == "SUBDIVISION":
+                self.__applySubdivision(stage)
+            elif name == "MENU":
+                self.hide_menu = True
+            elif name == "ZONES":
+                self.hide_overlay = True
+        except ReferenceError:
+            pass  # view or data removed during the gesture
+
+    # subdivision surfaces go through scene simplify, multires levels are lowered directly
+    def __applySubdivision(self, stage: int):
+        level = self.subdivision
+        render = self.scene.render
+        if not render.use_simplify or render.simplify_subdivision > level:
+            self.__set(stage, render, "use_simplify", True)
+            self.__set(stage, render, "simplify_subdivision", level)
+
+        for obj in self.objects:
+            for mod in obj.modifiers:
+                if mod.type != "MULTIRES":
+                    continue
+                if mod.levels > level:
+                    self.__set(stage, mod, "levels", level)
+                if obj == self.sculpt_object and mod.sculpt_levels > level:
+                    self.__set(stage, mod, "sculpt_levels", level)
+
+    def __restoreStage(self, stage: int):
+        name = STAGES[stage][0]
+        if name == "MENU":
+            self.hide_menu = False
+        elif name == "ZONES":
+            self.hide_overlay = False
+
+        for owner, attribute, value in reversed(self.stages[stage]):
+            try:
+                setattr(owner, attribute, value)
+            except ReferenceError:
+                pass  # owner removed during the gesture
+        self.stages[stage].clear()
+
+    def __set(self, stage: int, owner, attribute: str, value):
+        current = getattr(owner, attribute)
+        if current == value:
+            return
+        self.stages[stage].append((owner, attribute, current))
+        setattr(owner, attribute, value)
+
+
+navigation_lod = NavigationLOD()
+
+
+def unregister():
+    navigation_lod.end()
@@ -1,117 +1,183 @@
-import math
-
 import bpy
 import gpu
 from gpu_extras.batch import batch_for_shader
-from mathutils import Vector
-
-from .blender import preferences
+from mathutils.geometry import tessellate_polygon
+
+from .blender import snapshot, snapshot_frame_tick, zone_map
+from .geometry import ZoneDescriptor, ZoneLayout
+from .navigation import navigation_lod
+from .tracer import traced
+
+# full-region quad, scaled to the region in the vertex stage
+QUAD = ((0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0))
+QUAD_INDICES = ((0, 1, 2), (2, 3, 1))
+
+ZONE_VERTEX_SOURCE = """
+void main()
+{
+    regionPos = pos * regionSize;
+    gl_Position = ModelViewProjectionMatrix * vec4(regionPos, 0.0, 1.0);
+}
+"""
+
+# signed distances are negative inside a zone, coverage gives a one pixel anti-aliased edge
+ZONE_FRAGMENT_SOURCE = """
+float coverage(float dist)
+{
+    return clamp(0.5 - dist, 0.0, 1.0);
+}
+
+void main()
+{
+    vec2 mid = regionSize * 0.5;
+    float rail = min(regionPos.x - railWidth, (regionSize.x - railWidth) - regionPos.x);
+    float circle = length(regionPos - mid) - panRadius;
+
+    float railAlpha = mainColor.a * coverage(rail);
+    float circleAlpha = secondaryColor.a * coverage(circle) * float(showCircle);
+
+    // rails are composited over the pan circle
+    float alpha = railAlpha + circleAlpha * (1.0 - railAlpha);
+    if (alpha <= 0.0) {
+        discard;
+    }
+    vec3 color = mainColor.rgb * railAlpha + secondaryColor.rgb * circleAlpha * (1.0 - railAlpha);
+    fragColor = vec4(color / alpha, alpha);
+}
+"""
+
+
+def zone_shader() -> gpu.types.GPUShader:
+    info = gpu.types.GPUShaderCreateInfo()
+    info.push_constant("MAT4", "ModelViewProjectionMatrix")
+    info.push_constant("VEC2", "regionSize")
+    info.push_constant("FLOAT", "railWidth")
+    info.push_constant("FLOAT", "panRadius")
+    info.push_constant("INT", "showCircle")
+    info.push_constant("VEC4", "mainColor")
+    info.push_constant("VEC4", "secondaryColor")
+    info.vertex_in(0, "VEC2", "pos")
+
+    interface = gpu.types.GPUStageInterfaceInfo("touchview_zone_interface")
+    interface.smooth("VEC2", "regionPos")
+    info.vertex_out(interface)
+    info.fragment_out(0, "VEC4", "fragColor")
+
+    info.vertex_source(ZONE_VERTEX_SOURCE)
+    info.fragment_source(ZONE_FRAGMENT_SOURCE)
+    return gpu.shader.create_from_info(info)
 
 
 class Overlay:
     def __init__(self):
 
         self.meshes = []
+        self.shader = None
+        self.batch = None
+        self.layout_shader = None
+        self.layout_batches = {}  # region pointer -> ((zone map, colors), batch)
 
     def clear_overlays(self):
         for mesh in self.meshes:
             bpy.types.SpaceView3D.draw_handler_remove(mesh, "WINDOW")
         self.meshes = []
-
-    def __getMidpoint(self, view: bpy.types.Region) -> Vector:
-        return self.__getSize(view, 0.5)
-
-    def __getSize(self, view: bpy.types.Region, scalar: float = 1) -> Vector:
-        return Vector((view.width * scalar, view.height * scalar))
+        self.shader = None
+        self.batch = None
+        self.layout_shader = None
+        self.layout_batches = {}
 
     def __getColors(self, type: str):
-        prefs = preferences()
+        prefs = snapshot()
         if not prefs.is_enabled and not prefs.lazy_mode:
             return (0.0, 0.0, 0.0, 0.0)
         if type == "main" or not prefs.use_multiple_colors:
-            return prefs.overlay_main_color
+            return tuple(prefs.overlay_main_color)
         elif type == "secondary":
-            return prefs.overlay_secondary_color
+            return tuple(prefs.overlay_secondary_color)
         else:
             return (0.0, 0.0, 0.0, 0.0)
 
+    # shaders can't be compiled before the GPU context exists, build both on first draw
+    def __getBatch(self):
+        if self.shader is None:
+            self.shader = zone_shader()
+            self.batch = batch_for_shader(self.shader, "TRIS", {"pos": QUAD}, indices=QUAD_INDICES)
+        return self.shader, self.batch
+
     def drawUI(self):
-        _handle = bpy.types.SpaceView3D.draw_handler_add(self.__renderCircle, (), "WINDOW", "POST_PIXEL")
-        self.meshes.append(_handle)
-        _handle = bpy.types.SpaceView3D.draw_handler_add(self.__renderRailing, (), "WINDOW", "POST_PIXEL")
+        _handle = bpy.types.SpaceView3D.draw_handler_add(self.__renderZones, (), "WINDOW", "POST_PIXEL")
         self.meshes.append(_handle)
 
-    def __renderRailing(self):
-        prefs = preferences()
-        if not prefs.isVisible:
+    # one handler per 3D view, the region being drawn is already the context region
+    @traced("Overlay.render_zones")
+    def __renderZones(self):
+        snapshot_frame_tick()
+        prefs = snapshot()
+        if not prefs.isVisible or navigation_lod.hide_overlay:
             return
 
-        view = bpy.context.area
-        for region in view.regions:
-            if bpy.context.region.as_pointer() == region.as_pointer():
-                self.__makeBox(region, self.__getColors("main"))
-
-    def __makeBox(self, view: bpy.types.Region, color: tuple[float, float, float, float]):
-        prefs = preferences()
-        mid = self.__getMidpoint(view)
-        dimensions = self.__getSize(view)
-        left_rail = (
-            Vector((0.0, 0.0)),
-            Vector((mid.x * prefs.getWidth(), dimensions.y)),
-        )
-        right_rail = (
-            Vector((dimensions.x, 0.0)),
-            Vector((dimensions.x - mid.x * prefs.getWidth(), dimensions.y)),
-        )
-
-        self.__drawVectorBox(left_rail[0], left_rail[1], color)
-        self.__drawVectorBox(right_rail[0], right_rail[1], color)
-
-    def __drawVectorBox(self, a, b, color):
-        vertices = ((a.x, a.y), (b.x, a.y), (a.x, b.y), (b.x, b.y))
-        indices = ((0, 1, 2), (2, 3, 1))
-
-        self.__drawGeometry(vertices, indices, color, "TRIS")
-
-    def __renderCircle(self):
-        prefs = preferences()
-        if not prefs.isVisible:
+        region = bpy.context.region
+        if region is None or bpy.context.region_data is None:
+            return
+        self.__drawZones(region, bpy.context.region_data)
+
+    # zone shape and colors for one region, everything the shader reads besides the matrix
+    # the shape comes from the same zone map the touch operators hit-test against
+    def zoneGeometry(self, view: bpy.types.Region, view_data: bpy.types.RegionView3D) -> tuple:
+        zones = zone_map(view, view_data)
+        show_circle = 0 if zones.locked else 1
+        colors = (self.__getColors("main"), self.__getColors("secondary"))
+        return (view.width, view.height), zones.rail_width, zones.pan_radius, show_circle, *colors
+
+    def __drawZones(self, view: bpy.types.Region, view_data: bpy.types.RegionView3D):
+        zones = zone_map(view, view_data)
+        if zones.layout is not None:
+            self.__drawLayout(view, zones)
             return
+        size, rail_width, radius, show_circle, main_color, secondary_color = self.zoneGeometry(view, view_data)
 
-        view = bpy.context.area
-        for region in view.regions:
-            if bpy.context.region.as_pointer() == region.as_pointer() and not region.data.lock_rotation:
-                self.__makeCircle(region, self.__getColors("secondary"))
-
-    def __makeCircle(self, view: bpy.types.Region, color: tuple[float, float, float, float]):
-        prefs = preferences()
-        mid = self.__getMidpoint(view)
-        radius = math.dist((0, 0), mid) * (prefs.getRadius() * 0.5)  # type: ignore
-        self.__drawCircle(mid, radius, color)
-
-    def __drawCircle(self, mid: Vector, radius: float, color: tuple):
-        segments = 100
-        vertices = [mid]
-        indices = []
-        p = 0
-        for p in range(segments):
-            if p > 0:
-                point = Vector(
-                    (
-                        mid.x + radius * math.cos(math.radians(360 / segments) * p),
-                        mid.y + radius * math.sin(math.radians(360 / segments) * p),
-                    )
-                )
-                vertices.append(point)
-                indices.append((0, p - 1, p))
-        indices.append((0, 1, p))
-
-        self.__drawGeometry(vertices, indices, color, "TRIS")
-
-    def __drawGeometry(self, vertices, indices, color, type):
-        shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-        batch = batch_for_shader(shader, type, {"pos": vertices}, indices=indices)
+        shader, batch = self.__getBatch()
         shader.bind()
         gpu.state.blend_set("ALPHA")
-        shader.uniform_float("color", color)
+        matrix = gpu.matrix.get_projection_matrix() @ gpu.matrix.get_model_view_matrix()
+        shader.uniform_float("ModelViewProjectionMatrix", matrix)
+        shader.uniform_float("regionSize", size)
+        shader.uniform_float("railWidth", rail_width)
+        shader.uniform_float("panRadius", radius)
+        shader.uniform_int("showCircle", show_circle)
+        shader.uniform_float("mainColor", main_color)
+        shader.uniform_float("secondaryColor", secondary_color)
         batch.draw(shader)
+        gpu.state.blend_set("NONE")
+
+    # user zones of the region, one batch rebuilt only with its zone map or the colors
+    def __drawLayout(self, view: bpy.types.Region, zones: ZoneDescriptor):
+        if not zones.layout.zones:
+            return
+        if self.layout_shader is None:
+            self.layout_shader = gpu.shader.from_builtin("SMOOTH_COLOR")
+        inputs = (zones, (self.__getColors("main"), self.__getColors("secondary")))
+        key = view.as_pointer()
+        cached = self.layout_batches.get(key)
+        if cached is None or cached[0] != inputs:
+            cached = self.layout_batches[key] = (inputs, layout_batch(self.layout_shader, zones.layout, inputs[1]))
+
+        self.layout_shader.bind()
+        gpu.state.blend_set("ALPHA")
+        cached[1].draw(self.layout_shader)
+        gpu.state.blend_set("NONE")
+
+
+# triangles of every user zone with a color per vertex, dolly zones take the main color
+def layout_batch(shader: gpu.types.GPUShader, layout: ZoneLayout, colors: tuple) -> gpu.types.GPUBatch:
+    positions = []
+    vertex_colors = []
+    indices = []
+    for action, outline in layout.outlines():
+        color = colors[0] if action == "DOLLY" else colors[1]
+        points = [(x, y, 0.0) for x, y in outline]
+        base = len(positions)
+        indices.extend(tuple(base + index for index in triangle) for triangle in tessellate_polygon([points]))
+        positions.extend(points)
+        vertex_colors.extend([color] * len(points))
+    return batch_for_shader(shader, "TRIS", {"pos": positions, "color": vertex_colors}, indices=indices)
@@ -0,0 +1,228 @@
+import zlib
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy_extras.view3d_utils import (region_2d_to_origin_3d,
+                                     region_2d_to_vector_3d)
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+from .bvh import mesh_arrays
+
+##
+# SculptPivot
+#   - skips sculpt.set_pivot_position when the last computed pivot is still valid
+#   - a pivot is keyed by object, mode, geometry/transform version and, for mask based modes, the mask
+#   - the mask is compared by the address and length of its attribute array, then by a CRC of its values,
+#     the operator history is no use here since every touch press registers an entry of its own
+#   - SURFACE and ACTIVE follow the view or the cursor and are always placed
+##
+
+# pivots that follow something other than the geometry, always recomputed
+VOLATILE_MODES = {"SURFACE", "ACTIVE"}
+# pivots placed from the mask
+MASK_MODES = {"UNMASKED", "BORDER"}
+
+
+class SculptPivot:
+    def __init__(self):
+        self.state = None
+        self.versions: dict[int, int] = {}  # original pointer -> geometry/transform version
+        self.stats = {"calls": 0, "skipped": 0}
+
+    def invalidate(self):
+        self.state = None
+
+    def tag(self, update: bpy.types.DepsgraphUpdate):
+        if isinstance(update.id, bpy.types.Object) and (update.is_updated_geometry or update.is_updated_transform):
+            key = update.id.original.as_pointer()
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    # pivot for the mode, SURFACE is placed under the region center
+    def update(self, context, mode: str):
+        state = self.__state(context, mode)
+        if state is not None and state == self.state:
+            self.stats["skipped"] += 1
+            return
+        self.stats["calls"] += 1
+        if mode == "SURFACE":
+            region = context.region
+            bpy.ops.sculpt.set_pivot_position(mode=mode, mouse_x=region.width / 2, mouse_y=region.height / 2)
+        else:
+            bpy.ops.sculpt.set_pivot_position(mode=mode)
+        self.state = state
+
+    # orbit always needs the surface under the finger
+    def surface(self, x: float, y: float):
+        self.stats["calls"] += 1
+        bpy.ops.sculpt.set_pivot_position(mode="SURFACE", mouse_x=x, mouse_y=y)
+        self.state = None
+
+    # counted when a press replaces the pivot entirely, so no earlier call is needed
+    def skip(self):
+        self.stats["skipped"] += 1
+
+    # None when the pivot can't be reused
+    def __state(self, context, mode: str) -> tuple | None:
+        obj = context.active_object
+        if obj is None or mode in VOLATILE_MODES:
+            return None
+        key = obj.as_pointer()
+        return (key, mode, self.versions.get(key, 0), mask_state(obj) if mode in MASK_MODES else None)
+
+
+##
+# ProxyPivot
+#   - vertex-clustered copy of the active sculpt object, ray cast in Python for orbit pivots
+#   - rebuilt on a timer shortly after strokes end, a stale proxy is used until then
+#   - the pivot is applied by moving the view center to the hit depth, without changing the view
+##
+
+# seconds after the last geometry update before the proxy is rebuilt
+REBUILD_DELAY = 0.5
+
+
+class ProxyPivot:
+    def __init__(self):
+        self.object = None  # original object the proxy was built from
+        self.version = -1
+        self.resolution = 0
+        self.tree = None
+        # timers are looked up by the callable itself, so keep the one bound method that gets registered
+        self.timer = self.__rebuildLater
+
+    def clear(self):
+        self.object = None
+        self.version = -1
+        self.tree = None
+        if bpy.app.timers.is_registered(self.timer):
+            bpy.app.timers.unregister(self.timer)
+
+    def tag(self, update: bpy.types.DepsgraphUpdate):
+        if self.object is None or not isinstance(update.id, bpy.types.Object) or not update.is_updated_geometry:
+            return
+        if update.id.original == self.object:
+            if bpy.app.timers.is_registered(self.timer):
+                bpy.app.timers.unregister(self.timer)
+            bpy.app.timers.register(self.timer, first_interval=REBUILD_DELAY)
+
+    # move the orbit center to the proxy hit under region coordinates, False when nothing was hit
+    def orbit_at(self, context, coord: tuple[float, float], resolution: int) -> bool:
+        obj = context.active_object
+        if obj is None or obj.type != "MESH":
+            return False
+        depsgraph = context.evaluated_depsgraph_get()
+        if obj != self.object or resolution != self.resolution or self.tree is None:
+            self.__build(obj.evaluated_get(depsgraph), resolution)
+
+        region = context.region
+        rv3d = context.region_data
+        origin = region_2d_to_origin_3d(region, rv3d, coord)
+        direction = region_2d_to_vector_3d(region, rv3d, coord)
+        matrix = obj.matrix_world
+        matrix_inv = matrix.inverted()
+        local_origin = matrix_inv @ origin
+        local_direction = (matrix_inv @ (origin + direction)) - local_origin
+        location, _, _, _ = self.tree.ray_cast(local_origin, local_direction)
+        if location is None:
+            return False
+
+        # keep the eye and rotation, slide the view center along the view axis to the hit depth
+        hit = matrix @ location
+        view_inv = rv3d.view_matrix.inverted()
+        eye = view_inv.translation
+        forward = -(view_inv.to_3x3() @ Vector((0.0, 0.0, 1.0)))
+        depth = (hit - eye).dot(forward)
+        if depth <= 0.0:
+            return False
+        rv3d.view_location = eye + forward * depth
+        rv3d.view_distance = depth
+        return True
+
+    def __build(self, obj: bpy.types.Object, resolution: int):
+        vertices, triangles = cluster_mesh(*mesh_arrays(obj), resolution)
+        self.tree = BVHTree.FromPolygons(vertices.tolist(), triangles.tolist())
+        self.object = obj.original
+        self.resolution = resolution
+
+    def __rebuildLater(self):
+        try:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            self.__build(self.object.evaluated_get(depsgraph), self.resolution)
+        except (AttributeError, ReferenceError, RuntimeError):
+            self.tree = None  # no usable context, rebuild on the next orbit
+        return None
+
+
+# vertex clustering decimation: merge vertices sharing a grid cell, drop collapsed triangles
+def cluster_mesh(vertices: np.ndarray, triangles: np.ndarray, resolution: int) -> tuple[np.ndarray, np.ndarray]:
+    co = vertices.reshape(-1, 3)
+    tris = triangles.reshape(-1, 3)
+    if len(co) == 0:
+        return co, tris
+
+    low = co.min(axis=0)
+    size = float((co.max(axis=0) - low).max()) or 1.0
+    cells = np.floor((co - low) * (resolution / size)).astype(np.int64)
+    span = resolution + 1
+    keys = (cells[:, 0] * span + cells[:, 1]) * span + cells[:, 2]
+    _, cluster = np.unique(keys, return_inverse=True)
+    cluster = cluster.reshape(-1)
+
+    counts = np.bincount(cluster)
+    centers = np.stack([np.bincount(cluster, weights=co[:, axis]) for axis in range(3)], axis=1) / counts[:, None]
+    merged = cluster[tris]
+    keep = (merged[:, 0] != merged[:, 1]) & (merged[:, 1] != merged[:, 2]) & (merged[:, 0] != merged[:, 2])
+    return centers, merged[keep]
+
+
+# (array address, length, CRC) of the sculpt mask, None without a mask
+# masks on dyntopo and multires live outside the mesh, their tools still send a geometry update
+def mask_state(obj: bpy.types.Object) -> tuple | None:
+    if obj.type != "MESH":
+        return None
+    attribute = obj.data.attributes.get(".sculpt_mask")
+    if attribute is None or not len(attribute.data):
+        return None
+    values = np.empty(len(attribute.data), dtype=np.float32)
+    attribute.data.foreach_get("value", values)
+    return (attribute.data[0].as_pointer(), len(values), zlib.crc32(values))
+
+
+sculpt_pivot = SculptPivot()
+proxy_pivot = ProxyPivot()
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        sculpt_pivot.tag(update)
+        proxy_pivot.tag(update)
+
+
+@persistent
+def on_reset(*_):
+    sculpt_pivot.invalidate()
+    proxy_pivot.clear()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.undo_post, on_reset),
+    (bpy.app.handlers.redo_post, on_reset),
+    (bpy.app.handlers.load_post, on_reset),
+)
+
+
+def register():
+    for handler, callback in handlers:
+        handler.append(callback)
+
+
+def unregister():
+    for handler, callback in handlers:
+        if callback in handler:
+            handler.remove(callback)
+    sculpt_pivot.invalidate()
+    proxy_pivot.clear()
@@ -0,0 +1,124 @@
+import struct
+import time
+
+import bpy
+
+from .blender import snapshot
+
+##
+# EventRecorder
+#   - touch and drag operators hand every event they receive to record()
+#   - events are packed into a bytearray, names are interned into a string table
+#   - the log is written as: header, string table, record count, records
+#   - read_log() turns a log back into dicts for the replay driver
+##
+
+MAGIC = b"TVREC"
+VERSION = 1
+
+# time, operator, phase, type, value, area type, region type, pressure, x, y, region width, region height
+RECORD = struct.Struct("<dBBBBBBfhhHH")
+FIELDS = ("time", "operator", "phase", "type", "value", "area", "region", "pressure", "x", "y", "width", "height")
+STRINGS = ("operator", "type", "value", "area", "region")
+PHASES = ("invoke", "modal")
+
+# a byte per string index
+MAX_STRINGS = 256
+
+
+class EventRecorder:
+    def __init__(self):
+        self.buffer = bytearray()
+        self.strings: list[str] = []
+        self.indices: dict[str, int] = {}
+        self.start = 0.0
+
+    def record(self, operator: str, phase: str, context: bpy.types.Context, event: bpy.types.Event):
+        if not snapshot().record_events:
+            return
+        area = context.area
+        region = context.region
+        names = (operator, event.type, event.value, area.type if area else "NONE", region.type if region else "NONE")
+        indices = [self.__intern(name) for name in names]
+        if None in indices:
+            return
+
+        now = time.perf_counter()
+        if not self.buffer:
+            self.start = now
+        self.buffer += RECORD.pack(
+            now - self.start,
+            indices[0],
+            PHASES.index(phase),
+            indices[1],
+            indices[2],
+            indices[3],
+            indices[4],
+            event.pressure,
+            clamp_short(event.mouse_region_x),
+            clamp_short(event.mouse_region_y),
+            region.width if region else 0,
+            region.height if region else 0,
+        )
+
+    def count(self) -> int:
+        return len(self.buffer) // RECORD.size
+
+    def reset(self):
+        self.buffer = bytearray()
+        self.strings = []
+        self.indices = {}
+
+    def write(self, filepath: str):
+        with open(filepath, "wb") as file:
+            file.write(MAGIC + bytes((VERSION,)))
+            file.write(struct.pack("<H", len(self.strings)))
+            for name in self.strings:
+                encoded = name.encode("utf-8")
+                file.write(bytes((len(encoded),)) + encoded)
+            file.write(struct.pack("<I", self.count()))
+            file.write(self.buffer)
+
+    def __intern(self, name: str) -> int | None:
+        index = self.indices.get(name)
+        if index is None:
+            if len(self.strings) >= MAX_STRINGS:
+                return None
+            index = self.indices[name] = len(self.strings)
+            self.strings.append(name)
+        return index
+
+
+def clamp_short(value: int) -> int:
+    return min(max(value, -32768), 32767)
+
+
+# events of a log as dicts keyed by FIELDS, string and phase indices resolved
+def read_log(filepath: str) -> list[dict]:
+    with open(filepath, "rb") as file:
+        data = file.read()
+    if data[: len(MAGIC)] != MAGIC or data[len(MAGIC)] != VERSION:
+        raise ValueError("{} is not a touch event log".format(filepath))
+
+    offset = len(MAGIC) + 1
+    (string_count,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    strings = []
+    for _ in range(string_count):
+        length = data[offset]
+        strings.append(data[offset + 1 : offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+    (record_count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+
+    events = []
+    for values in RECORD.iter_unpack(data[offset : offset + record_count * RECORD.size]):
+        event = dict(zip(FIELDS, values))
+        for name in STRINGS:
+            event[name] = strings[event[name]]
+        event["phase"] = PHASES[event["phase"]]
+        events.append(event)
+    return events
+
+
+event_recorder = EventRecorder()
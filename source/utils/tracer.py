@@ -0,0 +1,113 @@
+import json
+from array import array
+from functools import wraps
+from time import perf_counter
+
+##
+# Tracer
+#   - opt-in timing of the addon hot paths, exported as Chrome/Perfetto trace-event JSON
+#   - spans go into a preallocated ring buffer, oldest spans are overwritten
+#   - disabled, a traced call costs one attribute check
+##
+
+CAPACITY = 65536
+
+
+class Tracer:
+    def __init__(self, capacity: int = CAPACITY):
+        self.enabled = False
+        self.names: list[str | None] = [None] * capacity
+        self.starts = array("d", bytes(8 * capacity))
+        self.ends = array("d", bytes(8 * capacity))
+        self.head = 0
+        self.count = 0
+
+    def record(self, name: str, start: float, end: float):
+        head = self.head
+        self.names[head] = name
+        self.starts[head] = start
+        self.ends[head] = end
+        self.head = (head + 1) % len(self.names)
+        if self.count < len(self.names):
+            self.count += 1
+
+    def reset(self):
+        self.head = 0
+        self.count = 0
+
+    def write_json(self, filepath: str):
+        capacity = len(self.names)
+        first = (self.head - self.count) % capacity
+        events = []
+        for offset in range(self.count):
+            index = (first + offset) % capacity
+            events.append(
+                {
+                    "name": self.names[index],
+                    "cat": "touchview",
+                    "ph": "X",
+                    "ts": self.starts[index] * 1e6,
+                    "dur": (self.ends[index] - self.starts[index]) * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+        with open(filepath, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+tracer = Tracer()
+
+
+# Blender checks the argument count of registered callbacks (invoke, draw_prepare),
+# so wrappers keep the exact arity unless the function takes defaults
+def traced(name: str):
+    def decorate(func):
+        arity = func.__code__.co_argcount
+        if func.__defaults__ is None and arity == 1:
+
+            def wrapper(a):
+                if not tracer.enabled:
+                    return func(a)
+                start = perf_counter()
+                try:
+                    return func(a)
+                finally:
+                    tracer.record(name, start, perf_counter())
+
+        elif func.__defaults__ is None and arity == 2:
+
+            def wrapper(a, b):
+                if not tracer.enabled:
+                    return func(a, b)
+                start = perf_counter()
+                try:
+                    return func(a, b)
+                finally:
+                    tracer.record(name, start, perf_counter())
+
+        elif func.__defaults__ is None and arity == 3:
+
+            def wrapper(a, b, c):
+                if not tracer.enabled:
+                    return func(a, b, c)
+                start = perf_counter()
+                try:
+                    return func(a, b, c)
+                finally:
+                    tracer.record(name, start, perf_counter())
+
+        else:
+
+            def wrapper(*args, **kwargs):
+                if not tracer.enabled:
+                    return func(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    tracer.record(name, start, perf_counter())
+
+        return wraps(func)(wrapper)
+
+    return decorate
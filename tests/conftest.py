@@ -0,0 +1,29 @@
+##
+# The addon package imports bpy on import, geometry.py is loaded from its path instead
+# so the tests run in plain CPython with numpy and pytest installed
+##
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# pytest imports the __init__.py of every package above a test to look for setup_module,
+# the checkout root is the addon package, register it as an empty module so its bpy imports never run
+addon = ModuleType(os.path.basename(ROOT))
+addon.__file__ = os.path.join(ROOT, "__init__.py")
+addon.__path__ = [ROOT]
+sys.modules.setdefault(addon.__name__, addon)
+
+
+def load_module(name: str, relative_path: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+load_module("geometry", os.path.join("source", "utils", "geometry.py"))
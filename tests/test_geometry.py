@@ -0,0 +1,272 @@
+import math
+
+import numpy as np
+import pytest
+from geometry import (CIRCLE_SEGMENTS, DOLLY, ORBIT, PAN, ZONES,
+                      ZoneDescriptor, ZoneLayout, area_point, bar_layout,
+                      classify_2d, classify_3d, parse_points, point_in_polygon,
+                      radial_layout, safe_area, view_locked, zone_2d, zone_3d,
+                      zone_shape)
+
+# 1000x600 region, rails 20% of the half width, pan circle 35% of the half diagonal
+WIDTH, HEIGHT, RAIL, RADIUS = 1000.0, 600.0, 0.4, 0.35
+
+
+##
+# Built-in zones
+##
+
+
+def test_zone_shape():
+    rail_width, pan_radius = zone_shape(WIDTH, HEIGHT, RAIL, RADIUS)
+    assert rail_width == pytest.approx(200.0)
+    assert pan_radius == pytest.approx(math.hypot(500.0, 300.0) * 0.175)
+
+
+@pytest.mark.parametrize(
+    "x, y, locked, swap, expected",
+    [
+        (100, 300, False, False, "DOLLY"),
+        (950, 300, False, False, "DOLLY"),
+        (500, 300, False, False, "PAN"),
+        (300, 100, False, False, "ORBIT"),
+        (500, 300, False, True, "ORBIT"),
+        (300, 100, False, True, "PAN"),
+        (300, 100, True, False, "PAN"),
+        (500, 300, True, True, "PAN"),
+        (100, 300, True, True, "DOLLY"),
+    ],
+)
+def test_zone_3d(x, y, locked, swap, expected):
+    assert zone_3d(x, y, WIDTH, HEIGHT, RAIL, RADIUS, locked, swap) == expected
+
+
+@pytest.mark.parametrize(
+    "x, swap, expected",
+    [
+        (100, False, "DOLLY"),
+        (900, True, "DOLLY"),
+        (500, False, "PAN"),
+        (500, True, "ORBIT"),
+    ],
+)
+def test_zone_2d(x, swap, expected):
+    assert zone_2d(x, WIDTH, RAIL, swap) == expected
+
+
+def test_view_locked():
+    assert view_locked(True, False, "NONE")
+    assert view_locked(False, True, "QUAD_SPLIT")
+    assert not view_locked(False, True, "NONE")
+    assert not view_locked(False, False, "QUAD_SPLIT")
+
+
+def test_classify_3d_matches_single_points():
+    rng = np.random.default_rng(3)
+    points = rng.uniform((0, 0), (WIDTH, HEIGHT), size=(500, 2))
+    for locked in (False, True):
+        for swap in (False, True):
+            zones = classify_3d(points, WIDTH, HEIGHT, RAIL, RADIUS, locked, swap)
+            expected = [zone_3d(x, y, WIDTH, HEIGHT, RAIL, RADIUS, locked, swap) for x, y in points]
+            assert [ZONES[zone] for zone in zones] == expected
+
+
+def test_classify_3d_per_point_regions():
+    # on the rail of the wide region, past the rail of the narrow one and locked
+    points = [(50, 300), (50, 300)]
+    zones = classify_3d(points, [WIDTH, 100.0], [HEIGHT, 600.0], RAIL, RADIUS, [False, True])
+    assert zones.tolist() == [DOLLY, PAN]
+
+
+def test_classify_2d():
+    zones = classify_2d([(100, 0), (500, 0), (950, 0)], WIDTH, RAIL)
+    assert zones.tolist() == [DOLLY, PAN, DOLLY]
+    assert classify_2d([(500, 0)], WIDTH, RAIL, swap=True).tolist() == [ORBIT]
+
+
+def test_descriptor_matches_classifiers():
+    rng = np.random.default_rng(7)
+    points = rng.uniform((0, 0), (WIDTH, HEIGHT), size=(500, 2))
+    for locked in (False, True):
+        descriptor = ZoneDescriptor(WIDTH, HEIGHT, RAIL, RADIUS, locked)
+        for swap in (False, True):
+            zones_3d = classify_3d(points, WIDTH, HEIGHT, RAIL, RADIUS, locked, swap)
+            zones_2d = classify_2d(points, WIDTH, RAIL, swap)
+            assert [descriptor.zone_3d(x, y, swap) for x, y in points] == [ZONES[zone] for zone in zones_3d]
+            assert [descriptor.zone_2d(x, y, swap) for x, y in points] == [ZONES[zone] for zone in zones_2d]
+
+
+##
+# User zones
+##
+
+
+def test_parse_points():
+    assert parse_points("0.1 0.2, 0.3 0.4,0.5 0.6") == ((0.1, 0.2), (0.3, 0.4), (0.5, 0.6))
+    assert parse_points("0.1 0.2, oops 0.4") == ()
+    assert parse_points("0.1") == ()
+    assert parse_points("") == ()
+
+
+def test_point_in_polygon():
+    square = ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0))
+    assert point_in_polygon(0.5, 0.5, square)
+    assert not point_in_polygon(1.5, 0.5, square)
+    assert not point_in_polygon(0.5, -0.1, square)
+
+
+# 400x200 region: dolly strip on the left, orbit circle in the middle, pan triangle on the right
+SPECS = (
+    ("RECT", "DOLLY", (0.0, 0.0, 0.25, 1.0)),
+    ("CIRCLE", "ORBIT", (0.5, 0.5, 0.25)),
+    ("POLYGON", "PAN", ((0.75, 0.1), (0.95, 0.1), (0.85, 0.9))),
+)
+
+
+@pytest.mark.parametrize(
+    "x, y, expected",
+    [
+        (50, 100, "DOLLY"),
+        (140, 100, None),
+        (200, 100, "ORBIT"),
+        (240, 100, "ORBIT"),
+        (260, 100, None),
+        (340, 50, "PAN"),
+        (305, 170, None),
+        (-1, 100, None),
+        (401, 100, None),
+        (50, 201, None),
+    ],
+)
+def test_layout_hit(x, y, expected):
+    assert ZoneLayout(SPECS, 400, 200).hit(x, y) == expected
+
+
+def test_layout_first_zone_wins():
+    specs = (
+        ("RECT", "PAN", (0.0, 0.0, 0.6, 1.0)),
+        ("RECT", "ORBIT", (0.4, 0.0, 1.0, 1.0)),
+    )
+    layout = ZoneLayout(specs, 100, 100)
+    assert layout.hit(50, 50) == "PAN"
+    assert layout.hit(70, 50) == "ORBIT"
+
+
+def test_layout_drops_empty_shapes():
+    specs = (
+        ("RECT", "PAN", (0.5, 0.0, 0.5, 1.0)),
+        ("CIRCLE", "PAN", (0.5, 0.5, 0.0)),
+        ("POLYGON", "PAN", ((0.1, 0.1), (0.2, 0.2))),
+        ("RECT", "DOLLY", (0.8, 0.8, 0.2, 0.2)),
+    )
+    layout = ZoneLayout(specs, 100, 100)
+    assert [action for _, action, _ in layout.zones] == ["DOLLY"]
+    # corners given in any order
+    assert layout.hit(50, 50) == "DOLLY"
+
+
+def test_layout_grid_matches_every_zone():
+    rng = np.random.default_rng(11)
+    specs = []
+    for _ in range(40):
+        x, y = rng.uniform(0.0, 1.0, size=2)
+        specs.append(("RECT", "PAN", (x, y, x + rng.uniform(0.0, 0.3), y + rng.uniform(0.0, 0.3))))
+        specs.append(("CIRCLE", "ORBIT", (x, y, rng.uniform(0.01, 0.2))))
+        specs.append(("POLYGON", "DOLLY", tuple(map(tuple, rng.uniform(0.0, 1.0, size=(4, 2))))))
+    layout = ZoneLayout(tuple(specs), 640, 480)
+
+    def brute(x, y):
+        for shape, action, params in layout.zones:
+            if shape == "RECT":
+                inside = params[0] <= x <= params[2] and params[1] <= y <= params[3]
+            elif shape == "CIRCLE":
+                inside = math.hypot(x - params[0], y - params[1]) <= params[2]
+            else:
+                inside = point_in_polygon(x, y, params)
+            if inside:
+                return action
+        return None
+
+    for x, y in rng.uniform((0, 0), (640, 480), size=(2000, 2)):
+        assert layout.hit(x, y) == brute(x, y)
+
+
+def test_layout_outlines():
+    outlines = ZoneLayout(SPECS, 400, 200).outlines()
+    # drawn back to front, so the zone that wins a hit ends up on top
+    assert [action for action, _ in outlines] == ["PAN", "ORBIT", "DOLLY"]
+    assert outlines[2][1] == [(0, 0), (100, 0), (100, 200), (0, 200)]
+    assert len(outlines[1][1]) == CIRCLE_SEGMENTS
+    assert all(math.hypot(x - 200, y - 100) == pytest.approx(50) for x, y in outlines[1][1])
+
+
+def test_descriptor_user_zones():
+    layout = ZoneLayout(SPECS, 400, 200)
+    descriptor = ZoneDescriptor(400, 200, RAIL, RADIUS, False, layout)
+    assert descriptor.zone_3d(50, 100, False) == "DOLLY"
+    assert descriptor.zone_3d(340, 50, False) == "PAN"
+    assert descriptor.zone_3d(340, 50, True) == "ORBIT"
+    # outside every zone: orbit in 3D views, pan in 2D views
+    assert descriptor.zone_3d(140, 100, False) == "ORBIT"
+    assert descriptor.zone_2d(140, 100, False) == "PAN"
+
+    locked = ZoneDescriptor(400, 200, RAIL, RADIUS, True, layout)
+    assert locked.zone_3d(200, 100, False) == "PAN"
+    assert locked.zone_3d(50, 100, True) == "DOLLY"
+
+
+##
+# Safe area and menu layout
+##
+
+
+def test_safe_area():
+    assert safe_area(200, 100, (10, 20, 5, 15), 4) == ((14, 9), (176, 81))
+
+
+def test_area_point():
+    assert area_point(((10, 20), (110, 220)), (50, 25)) == pytest.approx((60, 70))
+    assert area_point(((10, 20), (110, 220)), (0, 100)) == pytest.approx((10, 220))
+
+
+def test_radial_layout_spacing():
+    origin = (100.0, 50.0)
+    positions, skipped = radial_layout(origin, 20.0, [False] * 4, [False] * 4)
+    assert skipped == [False] * 4
+    expected = [(100, 70), (120, 50), (100, 30), (80, 50)]
+    for position, point in zip(positions, expected):
+        assert position == pytest.approx(point)
+
+
+def test_radial_layout_dependent_swaps_in_second_half():
+    dependent = [False, True, False, True, False]
+    positions, skipped = radial_layout((0.0, 0.0), 10.0, dependent, [False] * 5)
+    # index 1 is in the first half and keeps its slot, index 3 trades with the button after it
+    assert skipped == [False, False, False, False, True]
+    straight, _ = radial_layout((0.0, 0.0), 10.0, [False] * 5, [False] * 5)
+    assert positions[1] == pytest.approx(straight[1])
+    assert positions[3] == pytest.approx(straight[4])
+    assert positions[4] == pytest.approx(straight[3])
+
+
+def test_radial_layout_keeps_skipped():
+    positions, skipped = radial_layout((0.0, 0.0), 10.0, [False] * 3, [False, True, False])
+    assert positions[1] is None
+    assert skipped == [False, True, False]
+
+
+@pytest.mark.parametrize(
+    "side, expected",
+    [
+        ("TOP", [(40, 50), (50, 50), (60, 50)]),
+        ("BOTTOM", [(40, 0), (50, 0), (60, 0)]),
+        ("LEFT", [(0, 40), (0, 30), (0, 20)]),
+        ("RIGHT", [(100, 40), (100, 30), (100, 20)]),
+    ],
+)
+def test_bar_layout(side, expected):
+    assert bar_layout(((0, 0), (100, 50)), side, 3, 10) == pytest.approx(expected)
+
+
+def test_bar_layout_empty():
+    assert bar_layout(((0, 0), (100, 50)), "TOP", 0, 10) == []
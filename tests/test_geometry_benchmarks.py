@@ -0,0 +1,61 @@
+##
+# Microbenchmarks of the per-press and per-redraw math, run with pytest-benchmark:
+#   python -m pytest tests/test_geometry_benchmarks.py --benchmark-only
+##
+
+import numpy as np
+import pytest
+from geometry import (ZoneDescriptor, ZoneLayout, bar_layout, classify_3d,
+                      radial_layout, safe_area, zone_3d)
+
+pytest.importorskip("pytest_benchmark")
+
+WIDTH, HEIGHT, RAIL, RADIUS = 1920.0, 1080.0, 0.4, 0.35
+
+# a user layout as busy as the preferences UI makes practical
+SPECS = tuple(
+    ("RECT", "PAN", (i / 16, 0.0, (i + 0.5) / 16, 0.2)) for i in range(16)
+) + tuple(
+    ("CIRCLE", "ORBIT", (0.1 + i * 0.05, 0.6, 0.03)) for i in range(16)
+) + (("POLYGON", "DOLLY", ((0.1, 0.3), (0.9, 0.3), (0.9, 0.5), (0.5, 0.45), (0.1, 0.5))),)
+
+
+def test_zone_3d(benchmark):
+    benchmark(zone_3d, 700.0, 400.0, WIDTH, HEIGHT, RAIL, RADIUS, False, False)
+
+
+def test_descriptor_zone_3d(benchmark):
+    descriptor = ZoneDescriptor(WIDTH, HEIGHT, RAIL, RADIUS, False)
+    benchmark(descriptor.zone_3d, 700.0, 400.0, False)
+
+
+def test_descriptor_build(benchmark):
+    benchmark(ZoneDescriptor, WIDTH, HEIGHT, RAIL, RADIUS, False)
+
+
+def test_classify_3d_batch(benchmark):
+    points = np.random.default_rng(0).uniform((0, 0), (WIDTH, HEIGHT), size=(100_000, 2))
+    benchmark(classify_3d, points, WIDTH, HEIGHT, RAIL, RADIUS)
+
+
+def test_layout_build(benchmark):
+    benchmark(ZoneLayout, SPECS, WIDTH, HEIGHT)
+
+
+def test_layout_hit(benchmark):
+    layout = ZoneLayout(SPECS, WIDTH, HEIGHT)
+    benchmark(layout.hit, 960.0, 430.0)
+
+
+def test_safe_area(benchmark):
+    benchmark(safe_area, WIDTH, HEIGHT, (58.0, 240.0, 0.0, 48.0), 28.0)
+
+
+def test_radial_layout(benchmark):
+    dependent = [False] * 17
+    dependent[12] = True
+    benchmark(radial_layout, (960.0, 540.0), 120.0, dependent, [False] * 17)
+
+
+def test_bar_layout(benchmark):
+    benchmark(bar_layout, ((28.0, 28.0), (1892.0, 1052.0)), "RIGHT", 17, 46.0)